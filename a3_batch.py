@@ -0,0 +1,286 @@
+'''
+Headless, vectorised simulator that advances many independent Hacker games in
+lockstep. The boards of all games are held in one NumPy array of shape
+(count, size, size), indexed as [game, y, x], and every game action runs as a
+single array operation over the whole batch.
+'''
+import random
+from typing import Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+from a3_support import *
+from a3_model import CELL_CODES, CELL_DISPLAYS, EMPTY_CELL, generate_spawn_row
+
+# Shot codes accepted by BatchGame.fire.
+NO_SHOT = 0
+COLLECT_SHOT = 1
+DESTROY_SHOT = 2
+SHOT_CODES = {None: NO_SHOT, COLLECT: COLLECT_SHOT, DESTROY: DESTROY_SHOT}
+
+# Column shifts accepted by BatchGame.rotate_grid.
+ROTATION_SHIFTS = {None: 0, LEFT: ROTATIONS[0][0], RIGHT: ROTATIONS[1][0]}
+
+_PLAYER_CODE = CELL_CODES[PLAYER]
+_COLLECTABLE_CODE = CELL_CODES[COLLECTABLE]
+_DESTROYABLE_CODE = CELL_CODES[DESTROYABLE]
+_BLOCKER_CODE = CELL_CODES[BLOCKER]
+_BOMB_CODE = CELL_CODES[BOMB]
+_ENTITY_TYPE_CODES = np.array([CELL_CODES[display] for display in ENTITY_TYPES],
+                              dtype=np.uint8)
+
+# SplitMix64 constants used for the vectorised per-game random streams.
+_GOLDEN_GAMMA = np.uint64(0x9E3779B97F4A7C15)
+_MIX_1 = np.uint64(0xBF58476D1CE4E5B9)
+_MIX_2 = np.uint64(0x94D049BB133111EB)
+
+
+def encode_shots(shot_types: Sequence[Optional[str]]) -> np.ndarray:
+    '''
+    Convert a sequence of COLLECT, DESTROY or None into shot codes.
+
+    Parameters:
+        shot_types: The shot fired in each game, or None for no shot.
+    '''
+    return np.array([SHOT_CODES[shot] for shot in shot_types], dtype=np.int8)
+
+
+def encode_directions(directions: Sequence[Optional[str]]) -> np.ndarray:
+    '''
+    Convert a sequence of LEFT, RIGHT or None into column shifts.
+
+    Parameters:
+        directions: The rotation of each game, or None for no rotation.
+    '''
+    return np.array([ROTATION_SHIFTS[direction] for direction in directions],
+                    dtype=np.int64)
+
+
+class BatchGame:
+    '''
+    BatchGame follows the rules of Game for a whole batch of games at once.
+
+    Games stop changing once they are won or lost. Each game draws its spawn
+    rows from its own random stream, seeded from its seed, so a game's result
+    does not depend on which other games share the batch.
+    '''
+    def __init__(self, count: int, size: int = GRID_SIZE,
+                 seeds: Optional[Sequence[int]] = None,
+                 exact: bool = False) -> None:
+        '''
+        A batch is constructed with the number of games and the grid size.
+
+        Parameters:
+            count: The number of games in the batch.
+            size: The size of every grid.
+            seeds: One seed per game. Defaults to 0, 1, ..., count - 1.
+            exact: If True, each game draws its spawn rows from a
+                random.Random seeded like Game, so results match Game exactly
+                but spawning loops over the games in Python. Otherwise spawn
+                rows are drawn from vectorised SplitMix64 streams with the
+                same distribution.
+        '''
+        if seeds is None:
+            seeds = range(count)
+        if len(seeds) != count:
+            raise ValueError("one seed is needed per game")
+        self._count = count
+        self._size = size
+        self._player_x = size // 2
+        self._exact = exact
+        self._boards = np.zeros((count, size, size), dtype=np.uint8)
+        self._boards[:, 0, self._player_x] = _PLAYER_CODE
+        self._collected = np.zeros(count, dtype=np.int64)
+        self._destroyed = np.zeros(count, dtype=np.int64)
+        self._total_shots = np.zeros(count, dtype=np.int64)
+        self._ticks = np.zeros(count, dtype=np.int64)
+        if exact:
+            self._rngs = [random.Random(seed) for seed in seeds]
+        else:
+            self._states = np.array([seed & 0xFFFFFFFFFFFFFFFF for seed in seeds],
+                                    dtype=np.uint64)
+        self._games = np.arange(count)
+        self._columns = np.arange(size)
+
+    def reset(self, games: np.ndarray, seeds: Sequence[int]) -> None:
+        '''
+        Restart some games of the batch with new seeds.
+
+        Parameters:
+            games: The indices of the games to restart.
+            seeds: One new seed per restarted game.
+        '''
+        games = np.asarray(games, dtype=np.int64)
+        if len(seeds) != len(games):
+            raise ValueError("one seed is needed per game")
+        self._boards[games] = EMPTY_CELL
+        self._boards[games, 0, self._player_x] = _PLAYER_CODE
+        self._collected[games] = 0
+        self._destroyed[games] = 0
+        self._total_shots[games] = 0
+        self._ticks[games] = 0
+        if self._exact:
+            for game, seed in zip(games, seeds):
+                self._rngs[game] = random.Random(int(seed))
+        else:
+            self._states[games] = np.asarray(seeds).astype(np.uint64)
+
+    def get_count(self) -> int:
+        '''Return the number of games in the batch.'''
+        return self._count
+
+    def get_size(self) -> int:
+        '''Return the size of every grid.'''
+        return self._size
+
+    def get_boards(self) -> np.ndarray:
+        '''Return the (count, size, size) array of cell codes, indexed [game, y, x].'''
+        return self._boards
+
+    def get_num_collected(self) -> np.ndarray:
+        '''Return the number of Collectables acquired in each game.'''
+        return self._collected
+
+    def get_num_destroyed(self) -> np.ndarray:
+        '''Return the number of Destroyables removed with a shot in each game.'''
+        return self._destroyed
+
+    def get_total_shots(self) -> np.ndarray:
+        '''Return the number of shots taken in each game.'''
+        return self._total_shots
+
+    def get_ticks(self) -> np.ndarray:
+        '''Return the number of steps each game has taken.'''
+        return self._ticks
+
+    def has_won(self) -> np.ndarray:
+        '''Return a boolean array of the games that have been won.'''
+        return self._collected == COLLECTION_TARGET
+
+    def has_lost(self) -> np.ndarray:
+        '''Return a boolean array of the games where a Destroyable reached row 1.'''
+        return (self._boards[:, 1, :] == _DESTROYABLE_CODE).any(axis=1)
+
+    def get_active(self) -> np.ndarray:
+        '''Return a boolean array of the games that are neither won nor lost.'''
+        return ~(self.has_won() | self.has_lost())
+
+    def serialise(self, game: int) -> Dict[Tuple[int, int], str]:
+        '''
+        Return the board of one game in the same form as Grid.serialise.
+
+        Parameters:
+            game: The index of the game in the batch.
+        '''
+        ys, xs = np.nonzero(self._boards[game])
+        return {(int(x), int(y)): CELL_DISPLAYS[int(self._boards[game, y, x])]
+                for y, x in zip(ys, xs)}
+
+    def rotate_grid(self, shifts: np.ndarray) -> None:
+        '''
+        Rotate every row except the player row of each active game.
+
+        Parameters:
+            shifts: Per-game column shift, -1 for LEFT, 1 for RIGHT and 0 for
+                no rotation (see encode_directions).
+        '''
+        shifts = np.where(self.get_active(), np.asarray(shifts, dtype=np.int64), 0)
+        source = (self._columns[None, :] - shifts[:, None]) % self._size
+        rows = self._boards[:, 1:, :]
+        rows[...] = np.take_along_axis(rows, source[:, None, :], axis=2)
+
+    def fire(self, shots: np.ndarray) -> None:
+        '''
+        Fire a shot in each active game at the entity closest to the player
+        in the player's column.
+
+        Parameters:
+            shots: Per-game shot code, NO_SHOT, COLLECT_SHOT or DESTROY_SHOT
+                (see encode_shots).
+        '''
+        shots = np.where(self.get_active(), np.asarray(shots), NO_SHOT)
+        column = self._boards[:, 1:, self._player_x]
+        occupied = column != EMPTY_CELL
+        rows = occupied.argmax(axis=1)
+        targets = np.where(occupied.any(axis=1), column[self._games, rows], EMPTY_CELL)
+
+        collected = (targets == _COLLECTABLE_CODE) & (shots == COLLECT_SHOT)
+        destroyed = (targets == _DESTROYABLE_CODE) & (shots == DESTROY_SHOT)
+        bombed = (targets == _BOMB_CODE) & (shots != NO_SHOT)
+        hit = collected | destroyed | bombed
+
+        column[self._games[hit], rows[hit]] = EMPTY_CELL
+        self._collected += collected
+        self._destroyed += destroyed
+        self._total_shots += collected | destroyed
+
+    def step(self) -> None:
+        '''
+        Move every entity except the player of each active game by an offset
+        of MOVE and spawn a new top row.
+        '''
+        active = np.flatnonzero(self.get_active())
+        boards = self._boards
+        boards[active, 1:-1, :] = boards[active, 2:, :]
+        boards[active, -1, :] = EMPTY_CELL
+        if self._exact:
+            self._spawn_exact(active)
+        else:
+            self._spawn_vectorised(active)
+        self._ticks[active] += 1
+
+    def _spawn_exact(self, games: np.ndarray) -> None:
+        '''
+        Spawn the top row of the given games with generate_spawn_row.
+
+        Parameters:
+            games: The indices of the games to spawn into.
+        '''
+        top = self._size - 1
+        for game in games:
+            for x, display in generate_spawn_row(self._rngs[game], self._size):
+                self._boards[game, top, x] = CELL_CODES[display]
+
+    def _next_random(self, games: np.ndarray) -> np.ndarray:
+        '''
+        Advance the SplitMix64 stream of the given games and return one
+        uniform float in [0, 1) per game.
+
+        Parameters:
+            games: The indices of the games to draw for.
+        '''
+        with np.errstate(over='ignore'):
+            state = self._states[games] + _GOLDEN_GAMMA
+            self._states[games] = state
+            z = (state ^ (state >> np.uint64(30))) * _MIX_1
+            z = (z ^ (z >> np.uint64(27))) * _MIX_2
+            z ^= z >> np.uint64(31)
+        return (z >> np.uint64(11)).astype(np.float64) * (1.0 / (1 << 53))
+
+    def _spawn_vectorised(self, games: np.ndarray) -> None:
+        '''
+        Spawn the top row of the given games with the same distribution as
+        generate_spawn_row, drawing from each game's SplitMix64 stream.
+
+        Parameters:
+            games: The indices of the games to spawn into.
+        '''
+        size = self._size
+        count = len(games)
+        if count == 0:
+            return
+        entity_count = (self._next_random(games) * (size - 2)).astype(np.int64)
+        slots = np.arange(size)[None, :]
+        type_draws = np.stack([self._next_random(games) for _ in range(size)], axis=1)
+        codes = _ENTITY_TYPE_CODES[(type_draws * len(ENTITY_TYPES)).astype(np.int64)]
+        blocker = self._next_random(games) < 0.25
+        codes = np.where(slots < entity_count[:, None], codes, EMPTY_CELL)
+        codes = np.where((slots == entity_count[:, None]) & blocker[:, None],
+                         _BLOCKER_CODE, codes).astype(np.uint8)
+
+        # A random permutation of the columns per game places the slots.
+        order_draws = np.stack([self._next_random(games) for _ in range(size)], axis=1)
+        columns = np.argsort(order_draws, axis=1)
+        top = np.zeros((count, size), dtype=np.uint8)
+        np.put_along_axis(top, columns, codes, axis=1)
+        self._boards[games, size - 1, :] = top
@@ -0,0 +1,339 @@
+'''
+Benchmarks for the Hacker game model and renderers.
+
+Every benchmark runs on a board of a given size filled with entities to a
+given density, built from a fixed seed so runs are reproducible. Results are
+written as JSON. Passing --compare with an earlier result file reports every
+case that became slower by more than --threshold and exits with status 1.
+
+Examples:
+    python a3_bench.py --output before.json
+    python a3_bench.py --compare before.json --threshold 0.1
+'''
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import timeit
+import tracemalloc
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from a3_support import *
+from a3_model import ENTITY_INSTANCES, GRID_TYPES, Game, Grid, ScrollingGrid
+
+DEFAULT_SIZES = (7, 50, 200)
+DEFAULT_DENSITIES = (0.1, 0.5)
+BENCH_SEED = 2021
+FILL_TYPES = (COLLECTABLE, DESTROYABLE, BLOCKER)
+MODEL_CASES = ('Game.step', 'Game.rotate_grid', 'Game.fire', 'Game.has_lost',
+               'Grid.serialise', 'save/load')
+# Operations that change the board are timed on fresh copies of it, in
+# batches of FRESH_BATCH, until MIN_FRESH_SECONDS or MAX_FRESH_CALLS is reached.
+FRESH_BATCH = 50
+MIN_FRESH_SECONDS = 0.2
+MAX_FRESH_CALLS = 2000
+MEMORY_CALLS = 100
+
+
+def make_game(grid_type: type, size: int, density: float, seed: int = BENCH_SEED) -> Game:
+    '''
+    Return a game whose rows below the player are filled to a density, with
+    a Collectable as the entity nearest the player.
+
+    Parameters:
+        grid_type: The Grid class used to store the board.
+        size: The size of the grid.
+        density: The fraction of cells below the player row to fill.
+        seed: The seed for the game and for placing the entities.
+    '''
+    game = Game(size, grid_type, seed)
+    rng = random.Random(seed)
+    cells = [(x, y) for y in range(1, size) for x in range(size)]
+    positions = get_position_table(size)
+    for x, y in rng.sample(cells, int(len(cells) * density)):
+        game.get_grid().add_entity(positions.get(x, y), ENTITY_INSTANCES[rng.choice(FILL_TYPES)])
+    # A Collectable nearest the player gives every timed Game.fire a target.
+    grid = game.get_grid()
+    target = grid.get_nearest_in_column(size // 2) or positions.get(size // 2, size - 1)
+    grid.add_entity(target, ENTITY_INSTANCES[COLLECTABLE])
+    return game
+
+
+def measure(func: Callable[[], object], repeat: int) -> float:
+    '''
+    Return the best time in seconds of one call to func over repeat runs.
+
+    Parameters:
+        func: The operation to time.
+        repeat: The number of timed runs.
+    '''
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat = repeat, number = number)) / number
+
+
+def measure_memory(func: Callable[[], object], number: int = MEMORY_CALLS) -> Tuple[float, int]:
+    '''
+    Return the peak traced memory in KiB and the number of memory blocks
+    still allocated after calling func number times.
+
+    Parameters:
+        func: The operation to trace.
+        number: The number of calls to trace.
+    '''
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot()
+        tracemalloc.reset_peak()
+        for _ in range(number):
+            func()
+        _, peak = tracemalloc.get_traced_memory()
+        after = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+    blocks = sum(stat.count_diff for stat in after.compare_to(before, 'filename'))
+    return peak / 1024, blocks
+
+
+def measure_fresh(game: Game, operation: Callable[[Game], object], repeat: int) -> float:
+    '''
+    Return the best time in seconds of one call to operation on a fresh copy
+    of game over repeat runs. Each call gets its own copy, made outside the
+    timing, so operations that change the board always see the same board.
+
+    Parameters:
+        game: The game to copy for every call.
+        operation: The operation to time.
+        repeat: The number of timed runs.
+    '''
+    best = float('inf')
+    for _ in range(repeat):
+        elapsed = 0.0
+        calls = 0
+        while elapsed < MIN_FRESH_SECONDS and calls < MAX_FRESH_CALLS:
+            copies = [game.copy() for _ in range(FRESH_BATCH)]
+            start = timeit.default_timer()
+            for copy in copies:
+                operation(copy)
+            elapsed += timeit.default_timer() - start
+            calls += FRESH_BATCH
+        best = min(best, elapsed / calls)
+    return best
+
+
+def model_cases(game: Game, directory: str) -> Dict[str, Tuple[Callable[[Game], object], bool]]:
+    '''
+    Return the model operations to time on a game, each with whether it
+    changes the board and so must run on a fresh copy every call.
+
+    Parameters:
+        game: The game to run the operations on.
+        directory: A directory for the save files.
+    '''
+    from a3_save import read_save, write_save
+    filename = os.path.join(directory, 'bench.hack')
+    size = game.get_grid().get_size()
+    directions = [LEFT, RIGHT]
+
+    def rotate(game: Game) -> None:
+        game.rotate_grid(directions[0])
+        directions.reverse()
+
+    def fire(game: Game) -> None:
+        game.fire(COLLECT)
+
+    def save_load(game: Game) -> None:
+        write_save(filename, game, 0, 0)
+        read_save(filename, Game(size, type(game.get_grid()), 0))
+
+    # Rotating back and forth keeps the board as it was, so rotation is
+    # timed on one game. Repeated steps would drift to the spawn density and
+    # repeated shots would empty the player's column, so both get fresh copies.
+    return {'Game.step': (Game.step, True),
+            'Game.rotate_grid': (rotate, False),
+            'Game.fire': (fire, True),
+            'Game.has_lost': (Game.has_lost, False),
+            'Grid.serialise': (lambda game: game.get_grid().serialise(), False),
+            'save/load': (save_load, False)}
+
+
+def bench_model(sizes: Sequence[int], densities: Sequence[float],
+                grid_types: Sequence[str], repeat: int) -> List[dict]:
+    '''
+    Time every model operation for each grid type, size and density.
+
+    Parameters:
+        sizes: The grid sizes to run.
+        densities: The board densities to run.
+        grid_types: The names of the Grid classes to run.
+        repeat: The number of timed runs per case.
+    '''
+    results = []
+    with tempfile.TemporaryDirectory() as directory:
+        for grid_name in grid_types:
+            for size in sizes:
+                for density in densities:
+                    game = make_game(GRID_TYPES[grid_name], size, density)
+                    cases = model_cases(game, directory)
+                    for name in MODEL_CASES:
+                        operation, fresh = cases[name]
+                        if fresh:
+                            seconds = measure_fresh(game, operation, repeat)
+                            copies = iter([game.copy() for _ in range(MEMORY_CALLS)])
+                            peak, blocks = measure_memory(lambda: operation(next(copies)),
+                                                          MEMORY_CALLS)
+                        else:
+                            seconds = measure(lambda: operation(game), repeat)
+                            peak, blocks = measure_memory(lambda: operation(game), MEMORY_CALLS)
+                        results.append({'name': name, 'grid': grid_name, 'size': size,
+                                        'density': density, 'seconds_per_op': seconds,
+                                        'ops_per_sec': 1 / seconds, 'peak_kib': peak,
+                                        'net_blocks': blocks})
+    return results
+
+
+def bench_views(sizes: Sequence[int], densities: Sequence[float], repeat: int) -> List[dict]:
+    '''
+    Time GameField and ImageGameField on a withdrawn Tk window: draw_grid
+    redrawing the board after delete(ALL), and update_grid after
+    draw_background, alternating between a board and the same board one step
+    later so every update reconfigures the cells that changed. Cases that
+    cannot run, e.g. without a display, are reported as skipped.
+
+    Parameters:
+        sizes: The grid sizes to run.
+        densities: The board densities to run.
+        repeat: The number of timed runs per case.
+    '''
+    from a3 import GameField, ImageGameField
+    import tkinter as tk
+    cases = [(field_type, method, grid_type)
+             for field_type in (GameField, ImageGameField)
+             for method, grid_types in (('draw_grid', (Grid,)),
+                                        ('update_grid', (Grid, ScrollingGrid)))
+             for grid_type in grid_types]
+    try:
+        root = tk.Tk()
+    except tk.TclError as error:
+        return [{'name': f'{field_type.__name__}.{method}', 'grid': grid_type.__name__,
+                 'skipped': str(error)} for field_type, method, grid_type in cases]
+    root.withdraw()
+    results = []
+    try:
+        for field_type, method, grid_type in cases:
+            name = f'{field_type.__name__}.{method}'
+            for size in sizes:
+                for density in densities:
+                    try:
+                        field = field_type(root, size, MAP_WIDTH, MAP_HEIGHT)
+                    except Exception as error:
+                        results.append({'name': name, 'grid': grid_type.__name__, 'size': size,
+                                        'density': density, 'skipped': str(error)})
+                        continue
+                    game = make_game(grid_type, size, density)
+                    if method == 'draw_grid':
+                        grid = game.get_grid()
+
+                        def draw() -> None:
+                            field.delete(tk.ALL)
+                            field.draw_grid(grid)
+                            field.update_idletasks()
+                    else:
+                        stepped = game.copy()
+                        stepped.step()
+                        grids = [game.get_grid(), stepped.get_grid()]
+                        field.draw_background()
+
+                        def draw() -> None:
+                            grids.reverse()
+                            field.update_grid(grids[0])
+                            field.update_idletasks()
+
+                    seconds = measure(draw, repeat)
+                    results.append({'name': name, 'grid': grid_type.__name__, 'size': size,
+                                    'density': density, 'seconds_per_op': seconds,
+                                    'ops_per_sec': 1 / seconds})
+                    field.destroy()
+    finally:
+        root.destroy()
+    return results
+
+
+def case_key(result: dict) -> Tuple:
+    '''
+    Return the key that identifies a benchmark case across runs.
+
+    Parameters:
+        result: A benchmark result.
+    '''
+    return (result['name'], result.get('grid'), result.get('size'), result.get('density'))
+
+
+def compare(results: List[dict], baseline: List[dict], threshold: float) -> List[str]:
+    '''
+    Return a description of every case more than threshold slower than in
+    the baseline.
+
+    Parameters:
+        results: The results of this run.
+        baseline: The results of an earlier run.
+        threshold: The allowed slowdown, e.g. 0.1 for 10%.
+    '''
+    before = {case_key(result): result for result in baseline if 'seconds_per_op' in result}
+    regressions = []
+    for result in results:
+        old = before.get(case_key(result))
+        if old is None or 'seconds_per_op' not in result:
+            continue
+        change = result['seconds_per_op'] / old['seconds_per_op'] - 1
+        if change > threshold:
+            name, grid, size, density = case_key(result)
+            regressions.append(f"{name} [{grid} size={size} density={density}]: "
+                               f"{change:+.1%} ({old['seconds_per_op']:.3g}s -> "
+                               f"{result['seconds_per_op']:.3g}s)")
+    return regressions
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    '''Run the benchmarks from the command line and return the exit status.'''
+    parser = argparse.ArgumentParser(description = "Benchmark the Hacker game model and renderers.")
+    parser.add_argument('--sizes', type = int, nargs = '+', default = DEFAULT_SIZES)
+    parser.add_argument('--densities', type = float, nargs = '+', default = DEFAULT_DENSITIES)
+    parser.add_argument('--grids', nargs = '+', choices = sorted(GRID_TYPES), default = sorted(GRID_TYPES))
+    parser.add_argument('--repeat', type = int, default = 5, help = "timed runs per case")
+    parser.add_argument('--no-views', action = 'store_true', help = "skip the Tk renderer benchmarks")
+    parser.add_argument('--output', help = "write the JSON results to this file instead of stdout")
+    parser.add_argument('--compare', help = "JSON results of an earlier run to compare against")
+    parser.add_argument('--threshold', type = float, default = 0.1,
+                        help = "allowed slowdown before a case counts as a regression")
+    args = parser.parse_args(argv)
+
+    results = bench_model(args.sizes, args.densities, args.grids, args.repeat)
+    if not args.no_views:
+        results.extend(bench_views(args.sizes, args.densities, args.repeat))
+    report = {'version': 1, 'python': platform.python_version(),
+              'platform': platform.platform(), 'results': results}
+
+    if args.output:
+        with open(args.output, 'w', encoding = 'utf-8') as f:
+            json.dump(report, f, indent = 2)
+    else:
+        json.dump(report, sys.stdout, indent = 2)
+        print()
+
+    if args.compare:
+        with open(args.compare, encoding = 'utf-8') as f:
+            baseline = json.load(f)['results']
+        regressions = compare(results, baseline, args.threshold)
+        for regression in regressions:
+            print(f"REGRESSION {regression}", file = sys.stderr)
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,254 @@
+'''
+Bitboard representation of a Hacker game state.
+
+Each entity type is held in one integer with bit (y * size + x) set when the
+cell at (x, y) holds an entity of that type. For the 7x7 grid every board fits
+in 49 bits, so a state is cheap to copy, compare and hash.
+'''
+from functools import lru_cache
+from typing import Dict, Iterable, Tuple
+
+from a3_support import *
+
+BITBOARD_TYPES = (COLLECTABLE, DESTROYABLE, BLOCKER, BOMB)
+
+
+@lru_cache(maxsize=None)
+def get_masks(size: int) -> Tuple[int, int, int, int]:
+    '''
+    Return the (row 1, rows below the player, first column, last column)
+    masks for a grid size. The column masks exclude the player row.
+
+    Parameters:
+        size: The size of the grid.
+    '''
+    row = (1 << size) - 1
+    row_1 = row << size
+    below_player = ((1 << (size * size)) - 1) & ~row
+    first_column = 0
+    for y in range(1, size):
+        first_column |= 1 << (y * size)
+    return row_1, below_player, first_column, first_column << (size - 1)
+
+
+class BitBoard:
+    '''
+    A Hacker game state stored as one bitboard per entity type plus the shot
+    counters. It follows the rules of Game, with the player fixed at the
+    centre of the top row.
+    '''
+    __slots__ = ('_size', '_boards', '_collected', '_destroyed', '_total_shots', '_target')
+
+    def __init__(self, size: int = GRID_SIZE, target: int = COLLECTION_TARGET) -> None:
+        '''
+        An empty bitboard is constructed with the size of the grid.
+
+        Parameters:
+            size: The size of the grid.
+            target: The number of Collectables needed to win.
+        '''
+        self._size = size
+        self._target = target
+        self._boards = dict.fromkeys(BITBOARD_TYPES, 0)
+        self._collected = 0
+        self._destroyed = 0
+        self._total_shots = 0
+
+    @classmethod
+    def from_serialised(cls, serialised: Dict[Tuple[int, int], str],
+                        size: int = GRID_SIZE, collected: int = 0,
+                        destroyed: int = 0, total_shots: int = 0,
+                        target: int = COLLECTION_TARGET) -> "BitBoard":
+        '''
+        Build a bitboard from the output of Grid.serialise.
+
+        Parameters:
+            serialised: The serialised grid mapping (x, y) to a display character.
+            size: The size of the grid.
+            collected: The number of Collectables acquired.
+            destroyed: The number of Destroyables removed with a shot.
+            total_shots: The number of shots taken.
+            target: The number of Collectables needed to win.
+        '''
+        board = cls(size, target)
+        for (x, y), display in serialised.items():
+            if display != PLAYER:
+                board._boards[display] |= 1 << (y * size + x)
+        board._collected = collected
+        board._destroyed = destroyed
+        board._total_shots = total_shots
+        return board
+
+    def serialise(self) -> Dict[Tuple[int, int], str]:
+        '''Return the board in the same form as Grid.serialise.'''
+        size = self._size
+        result = {(self.get_player_x(), 0): PLAYER}
+        for display, board in self._boards.items():
+            while board:
+                low = board & -board
+                y, x = divmod(low.bit_length() - 1, size)
+                result[(x, y)] = display
+                board ^= low
+        return result
+
+    def copy(self) -> "BitBoard":
+        '''Return an independent copy of this state.'''
+        board = BitBoard.__new__(BitBoard)
+        board._size = self._size
+        board._boards = self._boards.copy()
+        board._collected = self._collected
+        board._destroyed = self._destroyed
+        board._total_shots = self._total_shots
+        board._target = self._target
+        return board
+
+    def get_size(self) -> int:
+        '''Return the size of the grid.'''
+        return self._size
+
+    def get_player_x(self) -> int:
+        '''Return the column of the player.'''
+        return self._size // 2
+
+    def get_board(self, display: str) -> int:
+        '''
+        Return the bitboard for one entity type.
+
+        Parameters:
+            display: The display character of the entity type.
+        '''
+        return self._boards[display]
+
+    def get_occupied(self) -> int:
+        '''Return a bitboard of every cell holding an entity other than the player.'''
+        occupied = 0
+        for board in self._boards.values():
+            occupied |= board
+        return occupied
+
+    def get_num_collected(self) -> int:
+        '''Return the total of Collectables acquired.'''
+        return self._collected
+
+    def get_num_destroyed(self) -> int:
+        '''Return the total of Destroyables removed with a shot.'''
+        return self._destroyed
+
+    def get_total_shots(self) -> int:
+        '''Return the total of shots taken.'''
+        return self._total_shots
+
+    def get_target(self) -> int:
+        '''Return the number of Collectables needed to win.'''
+        return self._target
+
+    def step(self, spawn_row: Iterable[Tuple[int, str]] = ()) -> None:
+        '''
+        Shift every row one towards the player, dropping the row that reaches
+        the player row, then add the spawned entities to the top row.
+
+        Parameters:
+            spawn_row: (column, display) pairs, as from generate_spawn_row.
+        '''
+        size = self._size
+        below_player = get_masks(size)[1]
+        boards = self._boards
+        for display in BITBOARD_TYPES:
+            boards[display] = (boards[display] >> size) & below_player
+        top = (size - 1) * size
+        for x, display in spawn_row:
+            bit = 1 << (top + x)
+            for other in BITBOARD_TYPES:
+                boards[other] &= ~bit
+            boards[display] |= bit
+
+    def rotate_grid(self, direction: str) -> None:
+        '''
+        Rotate every row below the player one column in the given direction,
+        wrapping around the edges.
+
+        Parameters:
+            direction: The rotation direction, LEFT or RIGHT.
+        '''
+        size = self._size
+        _, _, first_column, last_column = get_masks(size)
+        boards = self._boards
+        for display in BITBOARD_TYPES:
+            board = boards[display]
+            if direction == LEFT:
+                boards[display] = ((board & ~first_column) >> 1) | \
+                    ((board & first_column) << (size - 1))
+            else:
+                boards[display] = ((board & ~last_column) << 1) | \
+                    ((board & last_column) >> (size - 1))
+
+    def apply_action(self, action: int) -> None:
+        '''
+        Rotate the grid, fire or do nothing as given by one of ACTIONS.
+
+        Parameters:
+            action: The action to take.
+        '''
+        if action == ROTATE_LEFT_ACTION:
+            self.rotate_grid(LEFT)
+        elif action == ROTATE_RIGHT_ACTION:
+            self.rotate_grid(RIGHT)
+        elif action == FIRE_COLLECT_ACTION:
+            self.fire(COLLECT)
+        elif action == FIRE_DESTROY_ACTION:
+            self.fire(DESTROY)
+        elif action != NO_ACTION:
+            raise ValueError(f"unknown action {action!r}")
+
+    def fire(self, shot_type: str) -> None:
+        '''
+        Fire at the entity closest to the player in the player's column.
+
+        Parameters:
+            shot_type: The type of shot, COLLECT or DESTROY.
+        '''
+        column = get_masks(self._size)[2] << self.get_player_x()
+        targets = self.get_occupied() & column
+        if not targets:
+            return
+        target = targets & -targets
+        boards = self._boards
+        if boards[COLLECTABLE] & target and shot_type == COLLECT:
+            boards[COLLECTABLE] ^= target
+            self._collected += 1
+            self._total_shots += 1
+        elif boards[DESTROYABLE] & target and shot_type == DESTROY:
+            boards[DESTROYABLE] ^= target
+            self._destroyed += 1
+            self._total_shots += 1
+        elif boards[BOMB] & target:
+            boards[BOMB] ^= target
+
+    def has_won(self) -> bool:
+        '''Return True if the player has won the game.'''
+        return self._collected == self._target
+
+    def has_lost(self) -> bool:
+        '''Return True if a Destroyable has reached row 1.'''
+        return bool(self._boards[DESTROYABLE] & get_masks(self._size)[0])
+
+    def _key(self) -> Tuple[int, ...]:
+        '''Return the values that identify this state.'''
+        boards = self._boards
+        return (self._size, boards[COLLECTABLE], boards[DESTROYABLE],
+                boards[BLOCKER], boards[BOMB], self._collected,
+                self._destroyed, self._total_shots, self._target)
+
+    def __eq__(self, other: object) -> bool:
+        '''Return whether the other object is a bitboard with the same state.'''
+        if not isinstance(other, BitBoard):
+            return False
+        return self._key() == other._key()
+
+    def __hash__(self) -> int:
+        '''Return a hash of the state.'''
+        return hash(self._key())
+
+    def __repr__(self) -> str:
+        '''Return a representation of this bitboard.'''
+        return f'{self.__class__.__name__}({self._size})'
@@ -0,0 +1,411 @@
+'''
+An expectimax player for the Hacker game.
+
+The bot searches over BitBoard states. Decision nodes try every action in
+ACTIONS. A chance node follows every actions_per_tick actions: it steps the
+board and averages over spawn rows drawn with generate_spawn_row, so the
+random spawns of Game.generate_entities are treated as chance events. The
+full spawn distribution is too large to enumerate, so each chance node uses
+the same small sample of spawn rows at a given depth.
+
+The search deepens iteratively until its time budget runs out and plays the
+best action of the deepest completed search. Positions are identified by
+Zobrist hashes. Their values are kept in a bounded transposition table that
+evicts the least recently used entries and persists between moves.
+'''
+import random
+import time
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from a3_support import *
+from a3_bitboard import BITBOARD_TYPES, BitBoard
+from a3_model import Game, generate_spawn_row
+
+WIN_SCORE = 1000.0
+LOSS_SCORE = -1000.0
+COLLECT_SCORE = 10.0
+DESTROY_SCORE = 5.0
+# Penalty for a Destroyable in row y is THREAT_SCORE / y ** 2.
+THREAT_SCORE = 40.0
+
+DEFAULT_TIME_BUDGET = 0.1
+DEFAULT_MAX_DEPTH = 12
+DEFAULT_CHANCE_SAMPLES = 3
+DEFAULT_TABLE_SIZE = 200000
+# The policy bot searches this many steps ahead, with one sampled spawn row
+# per step: two steps of one sample play better than one step of several.
+POLICY_STEPS = 2
+POLICY_CHANCE_SAMPLES = 1
+ZOBRIST_SEED = 0x4841434B
+# Counters above this share the Zobrist key of the largest counter.
+MAX_HASHED_COUNT = 63
+
+
+class SearchTimeout(Exception):
+    '''Raised inside the search when the time budget of a move runs out.'''
+    pass
+
+
+@lru_cache(maxsize=None)
+def get_zobrist_keys(size: int) -> Tuple[Tuple[Tuple[int, ...], ...], Tuple[int, ...], Tuple[int, ...]]:
+    '''
+    Return the Zobrist keys for a grid size: one key per (entity type, cell)
+    in BITBOARD_TYPES order, then one key per collected and per destroyed
+    count.
+
+    Parameters:
+        size: The size of the grid.
+    '''
+    rng = random.Random(ZOBRIST_SEED ^ size)
+    cells = tuple(tuple(rng.getrandbits(64) for _ in range(size * size)) for _ in BITBOARD_TYPES)
+    collected = tuple(rng.getrandbits(64) for _ in range(MAX_HASHED_COUNT + 1))
+    destroyed = tuple(rng.getrandbits(64) for _ in range(MAX_HASHED_COUNT + 1))
+    return cells, collected, destroyed
+
+
+def zobrist_hash(board: BitBoard) -> int:
+    '''
+    Return the Zobrist hash of a state: the XOR of the keys of every occupied
+    cell and of the collected and destroyed counters.
+
+    Parameters:
+        board: The state to hash.
+    '''
+    cells, collected, destroyed = get_zobrist_keys(board.get_size())
+    key = (collected[min(board.get_num_collected(), MAX_HASHED_COUNT)]
+           ^ destroyed[min(board.get_num_destroyed(), MAX_HASHED_COUNT)])
+    for keys, display in zip(cells, BITBOARD_TYPES):
+        bits = board.get_board(display)
+        while bits:
+            low = bits & -bits
+            key ^= keys[low.bit_length() - 1]
+            bits ^= low
+    return key
+
+
+@lru_cache(maxsize=None)
+def get_row_masks(size: int) -> Tuple[int, ...]:
+    '''
+    Return the bitboard mask of every row of a grid size.
+
+    Parameters:
+        size: The size of the grid.
+    '''
+    row = (1 << size) - 1
+    return tuple(row << (y * size) for y in range(size))
+
+
+def evaluate(board: BitBoard) -> float:
+    '''
+    Return the heuristic value of a state that is neither won nor lost:
+    points for the shots made, less a penalty for every Destroyable that
+    grows as it nears the player.
+
+    Parameters:
+        board: The state to evaluate.
+    '''
+    score = COLLECT_SCORE * board.get_num_collected() + DESTROY_SCORE * board.get_num_destroyed()
+    destroyables = board.get_board(DESTROYABLE)
+    if destroyables:
+        for y, mask in enumerate(get_row_masks(board.get_size())[1:], 1):
+            count = bin(destroyables & mask).count('1')
+            if count:
+                score -= THREAT_SCORE * count / (y * y)
+    return score
+
+
+class TranspositionTable:
+    '''
+    A TranspositionTable maps Zobrist hashes to the value found by a search
+    of a given depth, keeping at most capacity entries. When full, the least
+    recently used entry is evicted.
+    '''
+    def __init__(self, capacity: int = DEFAULT_TABLE_SIZE) -> None:
+        '''
+        A transposition table is constructed with its capacity.
+
+        Parameters:
+            capacity: The largest number of entries kept.
+        '''
+        self._capacity = capacity
+        # Hash -> (depth, value), least recently used first.
+        self._entries: Dict[int, Tuple[int, float]] = {}
+        self._hits = 0
+        self._lookups = 0
+
+    def get(self, key: int, depth: int) -> Optional[float]:
+        '''
+        Return the stored value of a position if it was searched at least
+        as deep as depth, otherwise None.
+
+        Parameters:
+            key: The Zobrist hash of the position.
+            depth: The depth the value is needed for.
+        '''
+        self._lookups += 1
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return None
+        self._entries[key] = entry
+        if entry[0] < depth:
+            return None
+        self._hits += 1
+        return entry[1]
+
+    def store(self, key: int, depth: int, value: float) -> None:
+        '''
+        Store the value of a position searched to a depth.
+
+        Parameters:
+            key: The Zobrist hash of the position.
+            depth: The depth of the search.
+            value: The value found.
+        '''
+        entries = self._entries
+        entries.pop(key, None)
+        if len(entries) >= self._capacity:
+            del entries[next(iter(entries))]
+        entries[key] = (depth, value)
+
+    def get_hit_rate(self) -> float:
+        '''Return the fraction of lookups that found a usable value.'''
+        return self._hits / self._lookups if self._lookups else 0.0
+
+    def __len__(self) -> int:
+        '''Return the number of stored entries.'''
+        return len(self._entries)
+
+    def clear(self) -> None:
+        '''Remove every entry.'''
+        self._entries.clear()
+        self._hits = 0
+        self._lookups = 0
+
+
+class ExpectimaxBot:
+    '''
+    ExpectimaxBot chooses actions by an iteratively deepened expectimax
+    search under a time budget per move.
+    '''
+    def __init__(self, time_budget: Optional[float] = DEFAULT_TIME_BUDGET,
+                 max_depth: int = DEFAULT_MAX_DEPTH,
+                 chance_samples: int = DEFAULT_CHANCE_SAMPLES,
+                 actions_per_tick: int = 1,
+                 table_size: int = DEFAULT_TABLE_SIZE,
+                 seed: Optional[int] = None,
+                 target: int = COLLECTION_TARGET) -> None:
+        '''
+        A bot is constructed with its search limits.
+
+        Parameters:
+            time_budget: Seconds to search per move, or None to always search
+                to max_depth, which makes the bot deterministic for a seed.
+            max_depth: The deepest search in actions.
+            chance_samples: The number of spawn rows averaged at a chance node.
+            actions_per_tick: The number of actions between two game steps.
+            table_size: The capacity of the transposition table.
+            seed: The seed of the stream the spawn rows are sampled from.
+            target: The number of Collectables needed to win.
+        '''
+        self._time_budget = time_budget
+        self._max_depth = max_depth
+        self._chance_samples = chance_samples
+        self._actions_per_tick = actions_per_tick
+        self._target = target
+        self._table = TranspositionTable(table_size)
+        self._rng = random.Random(seed)
+        self._deadline: Optional[float] = None
+        self._spawns: List[List[List[Tuple[int, str]]]] = []
+        self._last_depth = 0
+        self._nodes = 0
+
+    def set_rng(self, rng: random.Random) -> None:
+        '''
+        Sample spawn rows from another random stream.
+
+        Parameters:
+            rng: The random stream.
+        '''
+        self._rng = rng
+
+    def get_table(self) -> TranspositionTable:
+        '''Return the transposition table.'''
+        return self._table
+
+    def get_last_depth(self) -> int:
+        '''Return the depth of the deepest completed search of the last move.'''
+        return self._last_depth
+
+    def get_nodes(self) -> int:
+        '''Return the number of nodes visited by the last move.'''
+        return self._nodes
+
+    def choose_action(self, game: Game, phase: int = 0) -> int:
+        '''
+        Return the action to take in a game.
+
+        Parameters:
+            game: The game to play.
+            phase: The number of actions already taken since the last step.
+        '''
+        grid = game.get_grid()
+        board = BitBoard.from_serialised(grid.serialise(), grid.get_size(),
+                                         game.get_num_collected(), game.get_num_destroyed(),
+                                         game.get_total_shots(), self._target)
+        return self.choose_board_action(board, phase)
+
+    def choose_board_action(self, board: BitBoard, phase: int = 0) -> int:
+        '''
+        Return the action to take in a state.
+
+        Parameters:
+            board: The state to play from.
+            phase: The number of actions already taken since the last step.
+        '''
+        start = time.perf_counter()
+        size = board.get_size()
+        self._spawns = [[generate_spawn_row(self._rng, size) for _ in range(self._chance_samples)]
+                        for _ in range(self._max_depth + 1)]
+        self._nodes = 0
+        self._last_depth = 0
+        best_action = NO_ACTION
+        order = list(ACTIONS)
+        for depth in range(1, self._max_depth + 1):
+            # The first iteration always completes so that a move is found.
+            if depth > 1 and self._time_budget is not None:
+                self._deadline = start + self._time_budget
+            try:
+                scores = self._search_root(board, depth, phase, order)
+            except SearchTimeout:
+                break
+            finally:
+                self._deadline = None
+            best_action = max(order, key=lambda action: scores.get(action, LOSS_SCORE - 1))
+            self._last_depth = depth
+            order.remove(best_action)
+            order.insert(0, best_action)
+            if self._time_budget is not None and time.perf_counter() - start > self._time_budget:
+                break
+        return best_action
+
+    def _search_root(self, board: BitBoard, depth: int, phase: int,
+                     order: Sequence[int]) -> Dict[int, float]:
+        '''
+        Return the value of each distinct action from the root.
+
+        Parameters:
+            board: The root state.
+            depth: The number of actions to search.
+            phase: The number of actions already taken since the last step.
+            order: The actions, best first.
+        '''
+        scores = {}
+        seen = set()
+        for action in order:
+            child = board.copy()
+            child.apply_action(action)
+            key = zobrist_hash(child)
+            if key in seen:
+                continue
+            seen.add(key)
+            scores[action] = self._after_action(child, depth - 1, phase + 1)
+        return scores
+
+    def _after_action(self, board: BitBoard, depth: int, phase: int) -> float:
+        '''
+        Return the value of a state just after an action.
+
+        Parameters:
+            board: The state after the action.
+            depth: The number of actions left to search.
+            phase: The number of actions taken since the last step.
+        '''
+        if board.has_won():
+            return WIN_SCORE
+        if phase >= self._actions_per_tick:
+            return self._chance(board, depth)
+        return self._decide(board, depth, phase)
+
+    def _decide(self, board: BitBoard, depth: int, phase: int) -> float:
+        '''
+        Return the value of the best action from a state.
+
+        Parameters:
+            board: The state to move from.
+            depth: The number of actions left to search.
+            phase: The number of actions taken since the last step.
+        '''
+        if depth == 0:
+            return evaluate(board)
+        self._nodes += 1
+        if self._deadline is not None and time.perf_counter() > self._deadline:
+            raise SearchTimeout()
+        key = zobrist_hash(board) ^ phase
+        value = self._table.get(key, depth)
+        if value is not None:
+            return value
+
+        best = LOSS_SCORE
+        seen = set()
+        for action in ACTIONS:
+            child = board.copy()
+            child.apply_action(action)
+            child_key = zobrist_hash(child)
+            if child_key in seen:
+                continue
+            seen.add(child_key)
+            best = max(best, self._after_action(child, depth - 1, phase + 1))
+            if best == WIN_SCORE:
+                break
+        self._table.store(key, depth, best)
+        return best
+
+    def _chance(self, board: BitBoard, depth: int) -> float:
+        '''
+        Return the value of stepping a state, averaged over the sampled spawn rows.
+
+        Parameters:
+            board: The state to step.
+            depth: The number of actions left to search.
+        '''
+        spawns = self._spawns[depth]
+        total = 0.0
+        for spawn_row in spawns:
+            child = board.copy()
+            child.step(spawn_row)
+            if child.has_lost():
+                total += LOSS_SCORE
+            else:
+                total += self._decide(child, depth, 0)
+        return total / len(spawns)
+
+
+# The game the policy bot is playing and the bot. A new game gets a new bot,
+# so no transposition table entry or spawn sample carries over between games
+# and every game plays the same whatever ran before it in the process.
+_policy_bot: Optional[Tuple[Game, ExpectimaxBot]] = None
+
+
+def expectimax_policy(game: Game, rng: random.Random, phase: int = 0,
+                      actions_per_step: int = 1, target: int = COLLECTION_TARGET) -> int:
+    '''
+    A policy for a3_simulate that plays with a fixed-depth ExpectimaxBot, so
+    that its results do not depend on the speed of the machine.
+
+    Parameters:
+        game: The game to play.
+        rng: The random stream of the game's policy.
+        phase: The number of actions already taken since the last step.
+        actions_per_step: The number of actions between two steps.
+        target: The number of Collectables needed to win.
+    '''
+    global _policy_bot
+    if _policy_bot is None or _policy_bot[0] is not game:
+        bot = ExpectimaxBot(time_budget=None, max_depth=POLICY_STEPS * actions_per_step,
+                            chance_samples=POLICY_CHANCE_SAMPLES,
+                            actions_per_tick=actions_per_step, target=target)
+        _policy_bot = (game, bot)
+    bot = _policy_bot[1]
+    bot.set_rng(rng)
+    return bot.choose_action(game, phase)
@@ -0,0 +1,344 @@
+'''
+The controllers of the Hacker game, which connect a Game to the tk views.
+'''
+import math
+import time
+import tkinter as tk
+from tkinter import filedialog, messagebox
+from tkinter.constants import TOP
+
+from a3_support import *
+from a3_model import Game, ScrollingGrid
+from a3_scheduler import TickProfiler, TickScheduler
+from a3_views import GameField, ImageGameField, ScoreBar, StatusBar
+
+class HackerController(object):
+    '''HackerControlleracts as the controller for the Hacker game.'''
+    def __init__(self, master: tk.Tk, size) -> None:
+        '''
+        The HackerController class is constructed from the size.
+
+        Parameters:
+            size: Represents the number of rows (= number of columns) in the game map.        
+        '''
+        self._size = size
+        self._master = master
+
+        # Create title.
+        self._title = tk.Label(self._master, text= TITLE, background = TITLE_BG, font = TITLE_FONT)
+        self._title.pack(side = TOP, fill = tk.X)
+
+        # Create game, gamefield and scorebar.
+        self._game = self._create_game()
+        self._gamefield = GameField(self._master, size, MAP_WIDTH, MAP_HEIGHT)
+        self._gamefield.pack(side = 'left', expand = tk.TRUE, fill = tk.BOTH)
+        self._scorebar = ScoreBar(self._master, size)
+        self._scorebar.pack(side = 'left', fill = tk.Y)
+        self._master.bind("<Key>", self.handle_keypress)
+        self._start_loop()
+
+    def _start_loop(self) -> None:
+        '''
+        Draws the first frame, then creates the scheduler that steps the game
+        every STEP_INTERVAL, along with the frame and profiling state used by
+        draw.
+        '''
+        self._frame_id = None
+        self._last_frame = 0.0
+        self._profiler: Optional[TickProfiler] = None
+        self.draw(self._game)
+        self._scheduler = TickScheduler(self._master)
+        self._scheduler.subscribe(STEP_INTERVAL, self.step)
+
+    def handle_keypress(self, event) -> None:
+        '''
+        This method should be called when the user presses any key during the game.
+        
+        Parameters:
+            event: Event component.
+        '''
+        keysym = event.keysym.lower()
+        if keysym == 'a':
+            self.handle_rotate(LEFT)
+
+        if keysym == 'd':
+            self.handle_rotate(RIGHT)
+
+        if keysym == 'return':
+            
+            self.handle_fire(COLLECT)
+        
+        if keysym == 'space':
+            self.handle_fire(DESTROY)  
+
+    def draw(self, game: Game) -> None:
+        '''
+        Updates the view to match the current game state, reconfiguring only
+        the canvas items that changed.
+        
+        Parameters:
+            game: Instantiated game.
+        '''
+        if self._frame_id is not None:
+            self._master.after_cancel(self._frame_id)
+            self._frame_id = None
+        self._last_frame = time.monotonic()
+        start = time.perf_counter()
+        self._gamefield.draw_background()
+        self._gamefield.update_grid(game.get_grid())
+        self._scorebar.draw_scores(game.get_num_collected(), game.get_num_destroyed())
+        if self._profiler is not None:
+            self._profiler.record(DRAW_SECTION, time.perf_counter() - start)
+
+    def set_profiler(self, profiler: Optional[TickProfiler]) -> None:
+        '''
+        Record the time spent in game logic, drawing and scheduler lateness
+        in a profiler, or stop recording when profiler is None.
+
+        Parameters:
+            profiler: The profiler, or None.
+        '''
+        self._profiler = profiler
+        self._scheduler.set_profiler(profiler)
+
+    def get_profiler(self) -> Optional[TickProfiler]:
+        '''Return the profiler recording this controller, or None.'''
+        return self._profiler
+
+    def _run_logic(self, method, *args) -> None:
+        '''
+        Call a Game method, timing it when profiling.
+
+        Parameters:
+            method: The bound Game method.
+            args: The arguments of the method.
+        '''
+        if self._profiler is None:
+            method(*args)
+            return
+        start = time.perf_counter()
+        method(*args)
+        self._profiler.record(LOGIC_SECTION, time.perf_counter() - start)
+
+    def request_draw(self) -> None:
+        '''
+        Schedules a single draw for the next display frame. Requests made
+        before that frame is drawn are coalesced into it, so there is at
+        most one draw every FRAME_INTERVAL milliseconds.
+        '''
+        if self._frame_id is None:
+            elapsed = (time.monotonic() - self._last_frame) * 1000
+            delay = max(0, math.ceil(FRAME_INTERVAL - elapsed))
+            self._frame_id = self._master.after(delay, self._draw_frame)
+
+    def _draw_frame(self) -> None:
+        '''Draws the frame scheduled by request_draw.'''
+        self._frame_id = None
+        self.draw(self._game)
+
+    def handle_rotate(self, direction) -> None:
+        '''
+        Handles rotation of the entities and requests a redraw of the game.
+        
+        Parameters:
+            direction: The rotation direction of the entities' positions.
+        '''
+        self._run_logic(self._game.rotate_grid, direction)
+        self.request_draw()
+
+    def handle_fire(self, shot_type) -> None:
+        '''
+        Handles the firing of the specified shot type and requests a redraw of the game.
+        
+        Parameters:
+            shot_type: The type of bomb.
+        '''
+        self._run_logic(self._game.fire, shot_type)
+        if self._game.has_won():
+            answer = messagebox.askquestion(title = None, message = "Do you still want to play?")
+            if answer == 'yes':
+                self.new_game()
+            else:
+                self._master.destroy()
+                exit(0)
+        self.request_draw()
+
+    def step(self) -> None:
+        '''The step method is called by the scheduler every STEP_INTERVAL milliseconds.'''
+        if self._game.has_lost():
+            answer = messagebox.askquestion(title = None, message = "Do you still want to play?")
+            if answer == 'yes':
+                self.new_game()
+            else:
+                self._master.destroy()
+                exit(0)                
+        self._run_logic(self._game.step)
+        self.request_draw()
+              
+    def _create_game(self) -> Game:
+        '''
+        Create a new game which records its inputs in a replay log. It uses
+        ScrollingGrid, whose steps and rotations move no entities.
+        '''
+        from a3_replay import RecordingGame
+        return RecordingGame(self._size, ScrollingGrid)
+
+    def new_game(self) -> None:
+        '''Refresh the game and enter a new round.'''
+        self._game = self._create_game()
+        self._scheduler.restart()
+        self.draw(self._game)
+
+
+class AdvancedHackerController(HackerController):
+    '''AdvancedHackerController as the controller for the Hacker game, which inherits from HackerController.'''
+    def __init__(self, master, size) -> None:
+        '''
+        The AdvancedHackerController class is constructed from the size.
+
+        Parameters:
+            size: Represents the number of rows (= number of columns) in the game map.        
+        '''
+        self._size = size
+        self._master = master
+
+        # Create title.
+        self._title = tk.Label(self._master, text= TITLE, background = TITLE_BG, font = TITLE_FONT)
+        self._title.pack(side = TOP, fill = tk.X)
+    
+        # Create game and scorebar.
+        self._game = self._create_game()
+
+        # Create imagegamefield
+        self._gamefield = ImageGameField(self._master, size, MAP_HEIGHT, MAP_WIDTH)
+        self._gamefield.pack(side = 'left', expand = tk.TRUE, fill = tk.BOTH)
+
+        # Create scorebar.
+        self._scorebar = ScoreBar(self._master, size)
+        self._scorebar.pack(side = 'left', fill = tk.Y)
+        self._master.bind("<Key>", self.handle_keypress)
+        self._start_loop()
+
+        # Create statusbar.
+        self._status_bar = StatusBar(self._master, self._scheduler)
+        menu_bar = tk.Menu(self._master)
+        self._master.config(menu = menu_bar)
+        file_menu = tk.Menu(menu_bar)
+
+        # Creat different functions in the menu.
+        menu_bar.add_cascade(label = "File", menu = file_menu)
+        file_menu.add_command(label = "New game", command = self.new_game)
+        file_menu.add_command(label = "Save game", command = self.save_game)
+        file_menu.add_command(label = "Load game", command = self.load_game)
+        file_menu.add_command(label = "Save replay", command = self.save_replay)
+        file_menu.add_command(label = "Quit", command = self.quit_game)
+
+        # Create the speed menu.
+        speed_menu = tk.Menu(menu_bar)
+        menu_bar.add_cascade(label = "Speed", menu = speed_menu)
+        for speed in GAME_SPEEDS:
+            speed_menu.add_command(label = f"{speed}x", command = lambda speed = speed: self._scheduler.set_speed(speed))
+
+        # Create the profile menu.
+        profile_menu = tk.Menu(menu_bar)
+        menu_bar.add_cascade(label = "Profile", menu = profile_menu)
+        profile_menu.add_command(label = "Start/stop profiling", command = self.toggle_profiling)
+        profile_menu.add_command(label = "Dump profile", command = self.dump_profile)
+
+        self._filename = None
+        self._status_bar.pack(side='bottom')
+
+    def save_game(self) -> None:
+        '''Prompt the user for the location to save their file,
+        and save all necessary information to replicate the current state of the game.'''
+        if self._filename is None:
+            filename = filedialog.asksaveasfilename()
+            if filename:
+                self._filename = filename
+
+        # Save game information.
+        if self._filename:
+            from a3_save import write_save
+            write_save(self._filename, self._game, self._status_bar.get_total_shots(), self._status_bar.get_time())
+                
+    def load_game(self) -> None:
+        '''Prompt the user for the location of the file to load a game from and load the game described in that file.'''
+        filename = filedialog.askopenfilename()
+
+        # Load game information.
+        if filename:
+            from a3_save import read_save
+            game = Game(self._size, ScrollingGrid)
+            try:
+                total_shots, time = read_save(filename, game)
+            except (OSError, ValueError) as error:
+                messagebox.showerror(title = "Load game", message = str(error))
+                return
+            self._filename = filename
+            self.new_game()
+            self._game = game
+
+            # Load statusbar.
+            self._status_bar._shots_counter = total_shots
+            self._status_bar._total_shots_num.configure(text = str(self._status_bar._shots_counter))            
+            self._status_bar._time_counter = time
+            self._status_bar._timer_num.configure(text = f"{self._status_bar._time_counter // 60}m {self._status_bar._time_counter % 60}s")
+            self.draw(self._game)
+                 
+    def save_replay(self) -> None:
+        '''Prompt the user for a location and save the replay log of the current game.'''
+        get_log = getattr(self._game, 'get_log', None)
+        if get_log is None:
+            messagebox.showerror(title = "Save replay", message = "Loaded games cannot be replayed.")
+            return
+        filename = filedialog.asksaveasfilename()
+        if filename:
+            get_log().save(filename)
+
+    def set_profiler(self, profiler: Optional[TickProfiler]) -> None:
+        '''
+        Record timings in a profiler and show its summary in the status bar,
+        or stop when profiler is None.
+
+        Parameters:
+            profiler: The profiler, or None.
+        '''
+        super().set_profiler(profiler)
+        self._status_bar.set_profiler(profiler)
+
+    def toggle_profiling(self) -> None:
+        '''Start profiling with an empty profiler, or stop profiling.'''
+        self.set_profiler(TickProfiler() if self._profiler is None else None)
+
+    def dump_profile(self) -> None:
+        '''Prompt the user for a location and write the profiler's histograms to it.'''
+        if self._profiler is None:
+            messagebox.showerror(title = "Dump profile", message = "Profiling is not running.")
+            return
+        filename = filedialog.asksaveasfilename(defaultextension = ".json")
+        if filename:
+            self._profiler.dump(filename)
+
+    def quit_game(self) -> None:
+        '''Prompt the player via a messagebox to ask whether they are sure they would like to quit. '''
+        self._master.destroy()
+        exit(0)
+
+    def new_game(self) -> None:
+        '''Start a new Hacker game.'''
+        super().new_game()
+        self._status_bar._shots_counter = 0
+        self._status_bar._time_counter = 0
+        self._status_bar._pause = False
+        self._status_bar._total_shots_num.configure(text = str(self._status_bar._shots_counter))
+        self._status_bar._timer_num.configure(text = f"{self._status_bar._time_counter // 60}m {self._status_bar._time_counter % 60}s")
+
+    def handle_fire(self, shot_type):
+        '''
+        Handles the firing of the specified shot type and redrawing of the game.
+        
+        Parameters:
+            shot_type: The type of bomb.
+        '''
+        self._status_bar.refresh_shots_num_label()
+        return super().handle_fire(shot_type)
@@ -0,0 +1,211 @@
+'''
+Reinforcement learning environments for the Hacker game.
+
+HackerEnv wraps one Game behind reset(seed) and step(action), which returns
+(observation, reward, done, info) with an action from ACTIONS. The
+observation is a (size, size) NumPy array of CELL_CODES, indexed [y, x]. It
+is a live, read-only view of the game's cells, so nothing is rebuilt from
+Grid.serialise on a step.
+
+HackerVectorEnv steps many games per call on a BatchGame. Every step is a
+handful of array operations over the whole batch, and observations, rewards
+and done flags are written into buffers allocated once. Finished games are
+restarted automatically with fresh seeds.
+'''
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from a3_support import *
+from a3_model import ArrayGrid, Game
+from a3_batch import BatchGame, COLLECT_SHOT, DESTROY_SHOT, NO_SHOT, ROTATION_SHIFTS
+
+COLLECT_REWARD = 1.0
+DESTROY_REWARD = 1.0
+WIN_REWARD = 10.0
+LOSS_REWARD = -10.0
+DEFAULT_MAX_TICKS = 1000
+
+# The column shift and shot code of each action, indexed by action.
+ACTION_SHIFTS = np.zeros(len(ACTIONS), dtype=np.int64)
+ACTION_SHIFTS[ROTATE_LEFT_ACTION] = ROTATION_SHIFTS[LEFT]
+ACTION_SHIFTS[ROTATE_RIGHT_ACTION] = ROTATION_SHIFTS[RIGHT]
+ACTION_SHOTS = np.full(len(ACTIONS), NO_SHOT, dtype=np.int8)
+ACTION_SHOTS[FIRE_COLLECT_ACTION] = COLLECT_SHOT
+ACTION_SHOTS[FIRE_DESTROY_ACTION] = DESTROY_SHOT
+
+
+class HackerEnv:
+    '''
+    HackerEnv is a single Hacker game with a reset/step interface. Each step
+    applies one action and then advances the game by one tick, or by one tick
+    every actions_per_tick actions.
+    '''
+    def __init__(self, size: int = GRID_SIZE, max_ticks: int = DEFAULT_MAX_TICKS,
+                 actions_per_tick: int = 1) -> None:
+        '''
+        An environment is constructed with the grid size and episode length.
+
+        Parameters:
+            size: The size of the grid.
+            max_ticks: The number of ticks after which an episode ends.
+            actions_per_tick: The number of actions between two game steps.
+        '''
+        self._size = size
+        self._max_ticks = max_ticks
+        self._actions_per_tick = actions_per_tick
+        self._game: Optional[Game] = None
+        self._observation: Optional[np.ndarray] = None
+        self._actions = 0
+        self._ticks = 0
+
+    def get_game(self) -> Game:
+        '''Return the game of the current episode.'''
+        return self._game
+
+    def reset(self, seed: Optional[int] = None) -> np.ndarray:
+        '''
+        Start a new episode and return its first observation.
+
+        Parameters:
+            seed: The seed of the game. A seed is drawn at random if none is given.
+        '''
+        self._game = Game(self._size, ArrayGrid, seed)
+        cells = self._game.get_grid().get_cells()
+        self._observation = np.frombuffer(cells, dtype=np.uint8).reshape(self._size, self._size)
+        self._actions = 0
+        self._ticks = 0
+        return self._observation
+
+    def step(self, action: int) -> Tuple[np.ndarray, float, bool, Dict[str, object]]:
+        '''
+        Apply an action, advance the game when a tick is due and return
+        (observation, reward, done, info).
+
+        Parameters:
+            action: One of ACTIONS.
+        '''
+        game = self._game
+        if game is None:
+            raise RuntimeError("reset must be called before step")
+        collected = game.get_num_collected()
+        destroyed = game.get_num_destroyed()
+        game.apply_action(action)
+        won = game.has_won()
+        lost = False
+        self._actions += 1
+        if not won and self._actions % self._actions_per_tick == 0:
+            game.step()
+            self._ticks += 1
+            lost = game.has_lost()
+
+        reward = (COLLECT_REWARD * (game.get_num_collected() - collected)
+                  + DESTROY_REWARD * (game.get_num_destroyed() - destroyed))
+        if won:
+            reward += WIN_REWARD
+        elif lost:
+            reward += LOSS_REWARD
+        done = won or lost or self._ticks >= self._max_ticks
+        info = {'ticks': self._ticks, 'collected': game.get_num_collected(),
+                'destroyed': game.get_num_destroyed(),
+                'total_shots': game.get_total_shots(), 'won': won, 'lost': lost}
+        return self._observation, reward, done, info
+
+
+class HackerVectorEnv:
+    '''
+    HackerVectorEnv runs count Hacker games in lockstep on a BatchGame. A
+    game that finishes is restarted with a new seed in the same step. Its
+    last board is reported in info['final_observation'].
+    '''
+    def __init__(self, count: int, size: int = GRID_SIZE,
+                 max_ticks: int = DEFAULT_MAX_TICKS, exact: bool = False) -> None:
+        '''
+        A vector environment is constructed with the number of games.
+
+        Parameters:
+            count: The number of games.
+            size: The size of every grid.
+            max_ticks: The number of ticks after which an episode ends.
+            exact: Spawn with random.Random like Game instead of the faster
+                vectorised streams, see BatchGame.
+        '''
+        self._count = count
+        self._size = size
+        self._max_ticks = max_ticks
+        self._exact = exact
+        self._seeds = np.random.default_rng()
+        self._batch: Optional[BatchGame] = None
+        self._observations = np.zeros((count, size, size), dtype=np.uint8)
+        self._rewards = np.zeros(count, dtype=np.float64)
+        self._dones = np.zeros(count, dtype=bool)
+        self._last_collected = np.zeros(count, dtype=np.int64)
+        self._last_destroyed = np.zeros(count, dtype=np.int64)
+
+    def get_count(self) -> int:
+        '''Return the number of games.'''
+        return self._count
+
+    def get_batch(self) -> BatchGame:
+        '''Return the batch of games.'''
+        return self._batch
+
+    def reset(self, seed: Optional[int] = None) -> np.ndarray:
+        '''
+        Start a new episode in every game and return the observations.
+
+        Parameters:
+            seed: The seed from which the seeds of every game, including
+                those of games restarted later, are drawn.
+        '''
+        self._seeds = np.random.default_rng(seed)
+        seeds = self._seeds.integers(0, 1 << 63, size = self._count, dtype = np.int64)
+        self._batch = BatchGame(self._count, self._size, seeds.tolist(), self._exact)
+        self._last_collected.fill(0)
+        self._last_destroyed.fill(0)
+        np.copyto(self._observations, self._batch.get_boards())
+        return self._observations
+
+    def step(self, actions: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray, Dict[str, np.ndarray]]:
+        '''
+        Apply one action in every game, advance the games by one tick and
+        return (observations, rewards, dones, info) as arrays over the games.
+        The returned arrays are reused by the next step.
+
+        Parameters:
+            actions: An integer array with one of ACTIONS per game.
+        '''
+        batch = self._batch
+        if batch is None:
+            raise RuntimeError("reset must be called before step")
+        actions = np.asarray(actions, dtype=np.int64)
+        batch.rotate_grid(ACTION_SHIFTS[actions])
+        batch.fire(ACTION_SHOTS[actions])
+        won = batch.has_won()
+        batch.step()
+        lost = batch.has_lost() & ~won
+
+        collected = batch.get_num_collected()
+        destroyed = batch.get_num_destroyed()
+        rewards = self._rewards
+        np.subtract(collected, self._last_collected, out = rewards, casting = 'unsafe')
+        rewards *= COLLECT_REWARD
+        rewards += DESTROY_REWARD * (destroyed - self._last_destroyed)
+        rewards += WIN_REWARD * won + LOSS_REWARD * lost
+        dones = self._dones
+        np.logical_or(won, lost, out = dones)
+        dones |= batch.get_ticks() >= self._max_ticks
+        info = {'won': won, 'lost': lost, 'ticks': batch.get_ticks().copy(),
+                'collected': collected.copy(), 'destroyed': destroyed.copy(),
+                'total_shots': batch.get_total_shots().copy()}
+
+        finished = np.flatnonzero(dones)
+        if len(finished):
+            info['final_observation'] = batch.get_boards()[finished]
+            info['finished'] = finished
+            seeds = self._seeds.integers(0, 1 << 63, size = len(finished), dtype = np.int64)
+            batch.reset(finished, seeds)
+        np.copyto(self._last_collected, collected)
+        np.copyto(self._last_destroyed, destroyed)
+        np.copyto(self._observations, batch.get_boards())
+        return self._observations, rewards, dones, info
@@ -0,0 +1,1049 @@
+'''
+The model of the Hacker game: entities, the grid backends and Game.
+
+This module needs no display stack, so headless code such as simulations,
+replays and benchmarks can import it without loading tkinter or PIL.
+'''
+import random
+from bisect import bisect_left, insort
+from itertools import compress
+from types import MappingProxyType
+from typing import Iterator, Mapping
+
+from a3_support import *
+
+class Entity:
+    '''Entity is an abstract class that is used to represent any element that can appear on the game’s grid.'''
+    __slots__ = ()
+
+    def display(self) -> str:
+        '''Return the character used to represent this entity in a text-based grid.'''
+        raise NotImplementedError()
+
+    def __repr__(self) -> str:
+        '''Return a representation of this entity.'''
+        return f'{self.__class__.__name__}()'
+
+
+class Player(Entity):
+    '''A subclass of Entity representing a Player within the game.'''
+    __slots__ = ()
+
+    def display(self) -> str:
+        '''Return the character representing a player: ’P’'''
+        return PLAYER
+
+
+class Destroyable(Entity):
+    '''A subclass of Entity representing a Destroyable within the game.'''
+    __slots__ = ()
+
+    def display(self) -> str:
+        '''Return the character representing a destroyable: ’D’'''
+        return DESTROYABLE
+
+
+class Collectable(Entity):
+    '''A subclass of Entity representing a Collectable within the game.'''
+    __slots__ = ()
+
+    def display(self) -> str:
+        '''Return the character representing a collectable: ’C’'''
+        return COLLECTABLE
+
+
+class Blocker(Entity):
+    '''A subclass of Entity representing a Blocker within the game.'''
+    __slots__ = ()
+
+    def display(self) -> str:
+        '''Return the character representing a blocker: ’B’'''
+        return BLOCKER
+
+
+class Bomb(Entity):
+    '''A subclass of Entity representing a Bomb within the game.'''
+    __slots__ = ()
+
+    def display(self) -> str:
+        '''Return the character representing a bomb: ’O’'''
+        return BOMB
+
+
+# Entities hold no state, so one shared instance of each type is used by
+# every grid instead of creating a new entity for each spawn or load.
+ENTITY_INSTANCES: Dict[str, Entity] = {PLAYER: Player(),
+                                       COLLECTABLE: Collectable(),
+                                       DESTROYABLE: Destroyable(),
+                                       BLOCKER: Blocker(),
+                                       BOMB: Bomb()}
+
+
+class Grid:
+    '''
+    The Grid class is used to represent the 2D grid of entities.
+
+    Entities are keyed by their position, so every scroll and rotation
+    rebuilds the dictionary in O(entities). Large boards should use
+    ScrollingGrid, whose scroll is O(size) and rotation O(1).
+    '''
+    def __init__(self, size: int) -> None:
+        '''
+        A grid is constructed with a size representing the number of rows 
+        (equal to the number of columns) in the grid.
+
+        Parameters:
+            size: The size of the grid.
+        '''
+        self._size = size
+        self._board_dict: Dict[Position, Entity] = {}
+        self._positions = get_position_table(size)
+        self._player_position = self._positions.get(size // 2, 0)
+        self._board_dict[self._player_position] = ENTITY_INSTANCES[PLAYER]
+        # The occupied rows (>= 1) of each column, in ascending order. Rows are
+        # stored as y + _scrolled, so a scroll only drops the rows leaving the
+        # grid instead of renumbering every entry.
+        self._column_rows: List[List[int]] = [[] for _ in range(size)]
+        self._scrolled = 0
+        # Number of Destroyables in each row.
+        self._destroyables: List[int] = [0] * size
+
+    def get_size(self) -> int:
+        '''Return the size of the grid.'''
+        return self._size
+
+    def add_entity(self, position: Position, entity: Entity) -> None:
+        '''
+        Add a given entity into the grid at a specified position.
+        
+        Parameters:
+            position: The specific position of the grid.
+            entity: The entity at this position.
+        '''
+        # If an entity already exists at the specified position.
+        if self.in_bounds(position):
+            previous = self._board_dict.get(position)
+            if previous is not None:
+                self._unindex_entity(position, previous.display())
+            self._board_dict[position] = entity
+            self._index_entity(position, entity.display())
+        else:
+            pass 
+
+    def get_entities(self) -> Dict[Position, Entity]:
+        '''
+        Return a copy of the dictionary containing grid entities, which is
+        safe to use while adding or removing entities.
+        '''
+        # Add entity into entities dictionary.
+        result ={}
+        for position, entity in self._board_dict.items():
+            result[position] = entity
+        return result
+
+    def get_entities_view(self) -> Mapping[Position, Entity]:
+        '''
+        Return a read-only view of the grid entities without copying them.
+        The view reflects later changes to the grid, so it must not be
+        iterated while the grid is being modified.
+        '''
+        return MappingProxyType(self._board_dict)
+
+    def get_entity(self, position: Position) -> Optional[Entity]:
+        '''
+        Return a entity from the grid at a specific position or None if the position does not have a mapped entity.
+        
+        Parameters:
+            position: The specific position of the grid.            
+        '''
+        return self._board_dict[position]
+
+    def remove_entity(self, position: Position) -> None:
+        '''
+        Remove an entity from the grid at a specified position.
+        
+        Parameters:
+            position: The specific position of the grid.  
+        '''
+        entity = self._board_dict.pop(position)
+        # Like add_entity, the player row is never indexed.
+        if self.in_bounds(position):
+            self._unindex_entity(position, entity.display())
+
+    def _column_index(self, x: int) -> int:
+        '''
+        Return the index into the column occupancy index for column x.
+
+        Parameters:
+            x: The column of the grid.
+        '''
+        return x
+
+    def _row_index(self, y: int) -> int:
+        '''
+        Return the index into the per-row counters for row y.
+
+        Parameters:
+            y: The row of the grid.
+        '''
+        return y
+
+    def _index_entity(self, position: Position, display: str) -> None:
+        '''
+        Record an entity added at a position in the column occupancy index
+        and the per-row counters.
+
+        Parameters:
+            position: The specific position of the grid.
+            display: The display character of the entity.
+        '''
+        insort(self._column_rows[self._column_index(position.get_x())],
+               position.get_y() + self._scrolled)
+        if display == DESTROYABLE:
+            self._destroyables[self._row_index(position.get_y())] += 1
+
+    def _unindex_entity(self, position: Position, display: str) -> None:
+        '''
+        Record an entity removed from a position in the column occupancy
+        index and the per-row counters.
+
+        Parameters:
+            position: The specific position of the grid.
+            display: The display character of the entity.
+        '''
+        rows = self._column_rows[self._column_index(position.get_x())]
+        del rows[bisect_left(rows, position.get_y() + self._scrolled)]
+        if display == DESTROYABLE:
+            self._destroyables[self._row_index(position.get_y())] -= 1
+
+    def _scroll_index(self) -> None:
+        '''
+        Update the column occupancy index and the per-row counters after
+        every row below the player row moved down one row. Entities in row 1
+        have left the grid.
+        '''
+        self._scrolled += 1
+        # The entities that were in row 1 are now stored as row 0.
+        left = self._scrolled
+        for rows in self._column_rows:
+            if rows and rows[0] == left:
+                del rows[0]
+        del self._destroyables[1]
+        self._destroyables.append(0)
+
+    def _rotate_index(self, shift: int) -> None:
+        '''
+        Update the column occupancy index after every row below the player
+        row rotated shift columns to the right.
+
+        Parameters:
+            shift: The number of columns moved, between 1 and size - 1.
+        '''
+        self._column_rows[:] = self._column_rows[-shift:] + self._column_rows[:-shift]
+
+    def get_destroyables_in_row(self, y: int) -> int:
+        '''
+        Return the number of Destroyables in row y.
+
+        Parameters:
+            y: The row of the grid.
+        '''
+        return self._destroyables[self._row_index(y)]
+
+    def get_nearest_in_column(self, x: int) -> Optional[Position]:
+        '''
+        Return the position of the entity in column x closest to the player
+        row, or None if nothing below the player row occupies that column.
+
+        Parameters:
+            x: The column of the grid.
+        '''
+        rows = self._column_rows[self._column_index(x)]
+        if not rows:
+            return None
+        return self._positions.get(x, rows[0] - self._scrolled)
+
+    def get_window(self, x_start: int, columns: int, rows: int) -> Iterator[Tuple[Position, Entity]]:
+        '''
+        Yield (position, entity) for every entity in columns x_start to
+        x_start + columns - 1 of rows 0 to rows - 1, without visiting the
+        rest of the grid.
+
+        Parameters:
+            x_start: The first column of the window.
+            columns: The number of columns in the window.
+            rows: The number of rows in the window, counted from the player row.
+        '''
+        board = self._board_dict
+        positions = self._positions
+        player = self._player_position
+        if player in board and x_start <= player.get_x() < x_start + columns and rows > 0:
+            yield player, board[player]
+        scrolled = self._scrolled
+        # Indexed rows are stored as y + _scrolled; stop before row `rows`.
+        end = rows + scrolled
+        for x in range(max(x_start, 0), min(x_start + columns, self._size)):
+            column = self._column_rows[self._column_index(x)]
+            for row in column[:bisect_left(column, end)]:
+                position = positions.get(x, row - scrolled)
+                yield position, board[position]
+
+    def serialise(self) -> Dict[Tuple[int, int], str]:
+        '''
+        Convert dictionary of Position and Entities into a simplified, 
+        serialised dictionary mapping tuples to characters.
+        '''
+        # Change the form of entities dictionary.
+        result = {}
+        for position, entity in self._board_dict.items():
+            result[(position.get_x(), position.get_y())] = entity.display()
+        return result
+
+    def in_bounds(self, position: Position) -> bool:
+        '''
+        Return a boolean based on whether the position is valid in terms of the dimensions of the grid.
+
+        Parameters:
+            position: The specific position of the grid.          
+        '''
+        if position.get_x() >= 0 and position.get_x() < self._size and position.get_y() >= 1 and position.get_y() < self._size:
+            return True
+        else:
+            return False
+
+    def scroll(self) -> None:
+        '''
+        Move every entity except the player by an offset of MOVE. Entities
+        that move off the grid are removed.
+        '''
+        positions = self._positions
+        board = self._board_dict
+        player = board.get(self._player_position)
+        # The player row is not indexed, so the lowest row kept is row 2.
+        moved = {positions.get(position.get_x() + MOVE[0], position.get_y() + MOVE[1]): entity
+                 for position, entity in board.items() if position.get_y() > 1}
+        board.clear()
+        if player is not None:
+            board[self._player_position] = player
+        board.update(moved)
+        self._scroll_index()
+
+    def rotate(self, direction: str) -> None:
+        '''
+        Rotate every entity except the player one column in the given
+        direction, wrapping around the edges of the grid.
+
+        Parameters:
+            direction: The rotation direction of the entities' positions.
+        '''
+        if direction == LEFT:
+            rotation = ROTATIONS[0]
+        else:
+            rotation = ROTATIONS[1]
+        size = self._size
+        shift = rotation[0] % size
+        if shift == 0:
+            return
+        player_position = self._player_position
+        positions = self._positions
+        board = self._board_dict
+        player = board.get(player_position)
+        moved = {positions.get((position.get_x() + shift) % size, position.get_y()): entity
+                 for position, entity in board.items() if position.get_y() != 0}
+        board.clear()
+        if player is not None:
+            board[player_position] = player
+        board.update(moved)
+        self._rotate_index(shift)
+
+    def copy(self) -> "Grid":
+        '''Return an independent copy of this grid.'''
+        grid = self.__class__.__new__(self.__class__)
+        grid.__dict__.update(self.__dict__)
+        grid._board_dict = self._board_dict.copy()
+        grid._column_rows = [rows.copy() for rows in self._column_rows]
+        grid._destroyables = self._destroyables.copy()
+        return grid
+
+    def __repr__(self) -> str:
+        '''Return a representation of this Grid.'''
+        return f'{self.__class__.__name__}({self._size})'
+
+
+# Single byte codes used by ArrayGrid to store an entity type in each cell.
+# Code 0 marks an empty cell.
+EMPTY_CELL = 0
+CELL_CODES: Dict[str, int] = {PLAYER: 1, COLLECTABLE: 2, DESTROYABLE: 3,
+                              BLOCKER: 4, BOMB: 5}
+CELL_DISPLAYS: Dict[int, str] = {code: display
+                                 for display, code in CELL_CODES.items()}
+CELL_ENTITIES: Dict[int, Entity] = {code: ENTITY_INSTANCES[display]
+                                    for display, code in CELL_CODES.items()}
+
+
+class ArrayGrid(Grid):
+    '''
+    A Grid that stores the board as a flat bytearray with one entity code per
+    cell instead of a dictionary of Position to Entity.
+    '''
+    def __init__(self, size: int) -> None:
+        '''
+        An array grid is constructed with a size representing the number of
+        rows (equal to the number of columns) in the grid.
+
+        Parameters:
+            size: The size of the grid.
+        '''
+        self._size = size
+        self._cells = bytearray(size * size)
+        self._positions = get_position_table(size)
+        self._player_position = self._positions.get(size // 2, 0)
+        self._cells[size // 2] = CELL_CODES[PLAYER]
+        # Bit y of _columns[x] is set when row y (>= 1) of column x is occupied.
+        self._columns: List[int] = [0] * size
+        # Number of Destroyables in each row.
+        self._destroyables: List[int] = [0] * size
+
+    def _row_start(self, y: int) -> int:
+        '''
+        Return the index of the first cell of row y in the flat cell array.
+
+        Parameters:
+            y: The row of the grid.
+        '''
+        return y * self._size
+
+    def _index_entity(self, position: Position, display: str) -> None:
+        '''
+        Record an entity added at a position in the column occupancy index
+        and the per-row counters.
+
+        Parameters:
+            position: The specific position of the grid.
+            display: The display character of the entity.
+        '''
+        self._columns[self._column_index(position.get_x())] |= 1 << position.get_y()
+        if display == DESTROYABLE:
+            self._destroyables[self._row_index(position.get_y())] += 1
+
+    def _unindex_entity(self, position: Position, display: str) -> None:
+        '''
+        Record an entity removed from a position in the column occupancy
+        index and the per-row counters.
+
+        Parameters:
+            position: The specific position of the grid.
+            display: The display character of the entity.
+        '''
+        self._columns[self._column_index(position.get_x())] &= ~(1 << position.get_y())
+        if display == DESTROYABLE:
+            self._destroyables[self._row_index(position.get_y())] -= 1
+
+    def _scroll_index(self) -> None:
+        '''
+        Update the column occupancy index and the per-row counters after
+        every row below the player row moved down one row. Entities in row 1
+        have left the grid.
+        '''
+        columns = self._columns
+        for x in range(self._size):
+            columns[x] = (columns[x] >> 1) & ~1
+        del self._destroyables[1]
+        self._destroyables.append(0)
+
+    def _rotate_index(self, shift: int) -> None:
+        '''
+        Update the column occupancy index after every row below the player
+        row rotated shift columns to the right.
+
+        Parameters:
+            shift: The number of columns moved, between 1 and size - 1.
+        '''
+        self._columns[:] = self._columns[-shift:] + self._columns[:-shift]
+
+    def get_nearest_in_column(self, x: int) -> Optional[Position]:
+        '''
+        Return the position of the entity in column x closest to the player
+        row, or None if nothing below the player row occupies that column.
+
+        Parameters:
+            x: The column of the grid.
+        '''
+        mask = self._columns[self._column_index(x)]
+        if mask == 0:
+            return None
+        return self._positions.get(x, (mask & -mask).bit_length() - 1)
+
+    def _index(self, position: Position) -> int:
+        '''
+        Return the index of the cell at a position in the flat cell array.
+
+        Parameters:
+            position: The specific position of the grid.
+        '''
+        return self._row_start(position.get_y()) + position.get_x()
+
+    def _occupied(self) -> Iterator[Tuple[int, int, int]]:
+        '''Yield (x, y, code) for every occupied cell, row by row.'''
+        cells = self._cells
+        size = self._size
+        # compress skips the empty cells, which are zero, without a Python loop.
+        for index in compress(range(len(cells)), cells):
+            y, x = divmod(index, size)
+            yield x, y, cells[index]
+
+    def _row_slice(self, y: int, x_start: int, columns: int) -> bytes:
+        '''
+        Return the cell codes of columns x_start to x_start + columns - 1 of
+        row y, where 0 <= x_start and x_start + columns <= size.
+
+        Parameters:
+            y: The row of the grid.
+            x_start: The first column of the slice.
+            columns: The number of columns in the slice.
+        '''
+        start = self._row_start(y) + x_start
+        return self._cells[start:start + columns]
+
+    def get_window(self, x_start: int, columns: int, rows: int) -> Iterator[Tuple[Position, Entity]]:
+        '''
+        Yield (position, entity) for every entity in columns x_start to
+        x_start + columns - 1 of rows 0 to rows - 1, reading one slice of the
+        cell array per row.
+
+        Parameters:
+            x_start: The first column of the window.
+            columns: The number of columns in the window.
+            rows: The number of rows in the window, counted from the player row.
+        '''
+        positions = self._positions
+        low = max(x_start, 0)
+        width = min(x_start + columns, self._size) - low
+        if width <= 0:
+            return
+        for y in range(min(rows, self._size)):
+            row = self._row_slice(y, low, width)
+            for column in compress(range(width), row):
+                yield positions.get(low + column, y), CELL_ENTITIES[row[column]]
+
+    def add_entity(self, position: Position, entity: Entity) -> None:
+        '''
+        Add a given entity into the grid at a specified position.
+
+        Parameters:
+            position: The specific position of the grid.
+            entity: The entity at this position.
+        '''
+        if self.in_bounds(position):
+            index = self._index(position)
+            if self._cells[index] != EMPTY_CELL:
+                self._unindex_entity(position, CELL_DISPLAYS[self._cells[index]])
+            self._cells[index] = CELL_CODES[entity.display()]
+            self._index_entity(position, entity.display())
+
+    def get_entities(self) -> Dict[Position, Entity]:
+        '''Return a dictionary containing grid entities.'''
+        positions = self._positions
+        return {positions.get(x, y): CELL_ENTITIES[code]
+                for x, y, code in self._occupied()}
+
+    def get_entities_view(self) -> Mapping[Position, Entity]:
+        '''
+        Return a read-only view of the grid entities without copying them.
+        The view reflects later changes to the grid, so it must not be
+        iterated while the grid is being modified.
+        '''
+        return ArrayGridView(self)
+
+    def get_cells(self) -> memoryview:
+        '''
+        Return a read-only view of the cell codes, row by row, with one
+        CELL_CODES byte per cell. The view reflects later changes to the
+        grid, except on ScrollingGrid, whose view is a copy.
+        '''
+        return memoryview(self._cells).toreadonly()
+
+    def copy(self) -> "ArrayGrid":
+        '''Return an independent copy of this grid.'''
+        grid = self.__class__.__new__(self.__class__)
+        grid.__dict__.update(self.__dict__)
+        grid._cells = self._cells.copy()
+        grid._columns = self._columns.copy()
+        grid._destroyables = self._destroyables.copy()
+        return grid
+
+    def get_entity(self, position: Position) -> Optional[Entity]:
+        '''
+        Return the entity from the grid at a specific position.
+        Like Grid, a KeyError is raised if the position is empty.
+
+        Parameters:
+            position: The specific position of the grid.
+        '''
+        code = self._cells[self._index(position)]
+        if code == EMPTY_CELL:
+            raise KeyError(position)
+        return CELL_ENTITIES[code]
+
+    def remove_entity(self, position: Position) -> None:
+        '''
+        Remove an entity from the grid at a specified position.
+
+        Parameters:
+            position: The specific position of the grid.
+        '''
+        index = self._index(position)
+        code = self._cells[index]
+        if code == EMPTY_CELL:
+            raise KeyError(position)
+        self._cells[index] = EMPTY_CELL
+        if self.in_bounds(position):
+            self._unindex_entity(position, CELL_DISPLAYS[code])
+
+    def serialise(self) -> Dict[Tuple[int, int], str]:
+        '''
+        Convert the cell array into a simplified, serialised dictionary
+        mapping tuples to characters.
+        '''
+        cells = self._cells
+        size = self._size
+        return {(index % size, index // size): CELL_DISPLAYS[cells[index]]
+                for index in compress(range(len(cells)), cells)}
+
+    def scroll(self) -> None:
+        '''
+        Move every entity except the player by an offset of MOVE by moving
+        the rows below the player row down one row of the cell array. Row 1
+        leaves the grid and the top row is cleared.
+        '''
+        size = self._size
+        cells = self._cells
+        cells[size:-size] = cells[2 * size:]
+        cells[-size:] = bytes(size)
+        self._scroll_index()
+
+    def rotate(self, direction: str) -> None:
+        '''
+        Rotate every entity except the player one column in the given
+        direction, wrapping around the edges of the grid.
+
+        Parameters:
+            direction: The rotation direction of the entities' positions.
+        '''
+        if direction == LEFT:
+            rotation = ROTATIONS[0]
+        else:
+            rotation = ROTATIONS[1]
+        size = self._size
+        shift = rotation[0] % size
+        if shift == 0:
+            return
+        cells = self._cells
+        rows = cells[size:]
+        # Move the rows as one block, then put back the cells that wrapped
+        # round the end of each row, one column at a time.
+        if shift <= size // 2:
+            cells[size + shift:] = rows[:-shift]
+            for column in range(shift):
+                cells[size + column::size] = rows[size - shift + column::size]
+        else:
+            back = size - shift
+            cells[size:-back] = rows[back:]
+            for column in range(back):
+                cells[2 * size - back + column::size] = rows[column::size]
+        self._rotate_index(shift)
+
+
+class ArrayGridView(Mapping):
+    '''A read-only Position to Entity mapping over the cells of an ArrayGrid.'''
+    def __init__(self, grid: ArrayGrid) -> None:
+        '''
+        The view is constructed from the grid it reads from.
+
+        Parameters:
+            grid: The array grid to view.
+        '''
+        self._grid = grid
+
+    def __getitem__(self, position: Position) -> Entity:
+        '''Return the entity at a position, raising KeyError if it is empty.'''
+        size = self._grid.get_size()
+        if not isinstance(position, Position) or not 0 <= position.get_x() < size \
+                or not 0 <= position.get_y() < size:
+            raise KeyError(position)
+        return self._grid.get_entity(position)
+
+    def __iter__(self) -> Iterator[Position]:
+        '''Iterate over the occupied positions.'''
+        positions = self._grid._positions
+        for x, y, _ in self._grid._occupied():
+            yield positions.get(x, y)
+
+    def __len__(self) -> int:
+        '''Return the number of occupied cells.'''
+        return len(self._grid._cells) - self._grid._cells.count(EMPTY_CELL)
+
+    def items(self) -> Iterator[Tuple[Position, Entity]]:
+        '''Iterate over (position, entity) pairs in a single pass over the cells.'''
+        positions = self._grid._positions
+        for x, y, code in self._grid._occupied():
+            yield positions.get(x, y), CELL_ENTITIES[code]
+
+
+class ScrollingGrid(ArrayGrid):
+    '''
+    An ArrayGrid whose rows below the player row sit in a circular buffer.
+
+    Scrolling advances the head of the buffer and clears the row that falls
+    off the top, so a step costs O(size) and allocates nothing. The player
+    row (y = 0) is pinned at the start of the cell array.
+
+    Rotation only changes a column offset which is applied whenever a cell is
+    read or written, so it is O(1).
+    '''
+    def __init__(self, size: int) -> None:
+        '''
+        A scrolling grid is constructed with a size representing the number
+        of rows (equal to the number of columns) in the grid.
+
+        Parameters:
+            size: The size of the grid.
+        '''
+        super().__init__(size)
+        self._head = 0
+        self._offset = 0
+        self._ring_rows = max(size - 1, 1)
+        self._empty_row = bytes(size)
+
+    def get_cells(self) -> memoryview:
+        '''
+        Return a read-only view of the cell codes, row by row, with one
+        CELL_CODES byte per cell. The rows are stored out of order and
+        unrotated, so unlike ArrayGrid the view is of a row-ordered copy
+        and does not reflect later changes to the grid.
+        '''
+        size = self._size
+        cells = self._cells
+        offset = self._offset
+        rows = [cells[:size]]
+        for y in range(1, size):
+            start = self._row_start(y)
+            row = cells[start:start + size]
+            rows.append(row[offset:] + row[:offset])
+        return memoryview(bytearray().join(rows)).toreadonly()
+
+    def _row_start(self, y: int) -> int:
+        '''
+        Return the index of the first cell of row y in the flat cell array.
+
+        Parameters:
+            y: The row of the grid.
+        '''
+        if y == 0:
+            return 0
+        return (1 + (y - 1 + self._head) % self._ring_rows) * self._size
+
+    def _index(self, position: Position) -> int:
+        '''
+        Return the index of the cell at a position in the flat cell array,
+        applying the column offset to every row except the player row.
+
+        Parameters:
+            position: The specific position of the grid.
+        '''
+        y = position.get_y()
+        if y == 0:
+            return position.get_x()
+        return self._row_start(y) + (position.get_x() + self._offset) % self._size
+
+    def _row_slice(self, y: int, x_start: int, columns: int) -> bytes:
+        '''
+        Return the cell codes of columns x_start to x_start + columns - 1 of
+        row y, where 0 <= x_start and x_start + columns <= size. The column
+        offset may split the slice across the end of the stored row.
+
+        Parameters:
+            y: The row of the grid.
+            x_start: The first column of the slice.
+            columns: The number of columns in the slice.
+        '''
+        row_start = self._row_start(y)
+        start = x_start if y == 0 else (x_start + self._offset) % self._size
+        end = start + columns
+        cells = self._cells
+        if end <= self._size:
+            return cells[row_start + start:row_start + end]
+        return cells[row_start + start:row_start + self._size] + \
+            cells[row_start:row_start + end - self._size]
+
+    def _column_index(self, x: int) -> int:
+        '''
+        Return the index into the column occupancy index for column x, which
+        is kept by physical column so that rotation does not touch it.
+
+        Parameters:
+            x: The column of the grid.
+        '''
+        return (x + self._offset) % self._size
+
+    def _row_index(self, y: int) -> int:
+        '''
+        Return the index into the per-row counters for row y, which are kept
+        by buffer slot so that scrolling does not move them.
+
+        Parameters:
+            y: The row of the grid.
+        '''
+        if y == 0:
+            return 0
+        return 1 + (y - 1 + self._head) % self._ring_rows
+
+    def _occupied(self) -> Iterator[Tuple[int, int, int]]:
+        '''Yield (x, y, code) for every occupied cell, row by row.'''
+        size = self._size
+        columns = range(size)
+        # Each row is read unrotated, so compress can skip its empty cells.
+        for y in columns:
+            row = self._row_slice(y, 0, size)
+            for x in compress(columns, row):
+                yield x, y, row[x]
+
+    def serialise(self) -> Dict[Tuple[int, int], str]:
+        '''
+        Convert the cell array into a simplified, serialised dictionary
+        mapping tuples to characters.
+        '''
+        return {(x, y): CELL_DISPLAYS[code] for x, y, code in self._occupied()}
+
+    def scroll(self) -> None:
+        '''
+        Move every entity except the player by an offset of MOVE by advancing
+        the head of the row buffer. The row leaving the grid is cleared and
+        becomes the new, empty spawn row.
+        '''
+        start = self._row_start(1)
+        self._cells[start:start + self._size] = self._empty_row
+        self._destroyables[self._row_index(1)] = 0
+        self._head = (self._head + 1) % self._ring_rows
+        columns = self._columns
+        for column in range(self._size):
+            columns[column] = (columns[column] >> 1) & ~1
+
+    def rotate(self, direction: str) -> None:
+        '''
+        Rotate every entity except the player one column in the given
+        direction by shifting the column offset.
+
+        Parameters:
+            direction: The rotation direction of the entities' positions.
+        '''
+        if direction == LEFT:
+            self._offset = (self._offset - ROTATIONS[0][0]) % self._size
+        else:
+            self._offset = (self._offset - ROTATIONS[1][0]) % self._size
+
+
+# Grid class name -> Grid class, used to choose a backend by name, e.g. on
+# the command line.
+GRID_TYPES: Dict[str, type] = {grid_type.__name__: grid_type
+                               for grid_type in (Grid, ArrayGrid, ScrollingGrid)}
+
+
+def generate_spawn_row(rng, size: int) -> List[Tuple[int, str]]:
+    '''
+    Draw the entities spawned in the top row after a step, as a list of
+    (column, display) pairs. Game.generate_entities and the batch simulator
+    share this so that the same random stream spawns the same entities.
+
+    Parameters:
+        rng: The random stream to draw from, e.g. the random module.
+        size: The size of the grid.
+    '''
+    # Generate amount
+    entity_count = rng.randint(0, size - 3)
+    entities = rng.choices(ENTITY_TYPES, k=entity_count)
+
+    # Blocker in a 1 in 4 chance
+    blocker = rng.randint(1, 4) % 4 == 0
+
+    # UNCOMMENT THIS FOR TASK 3 (CSSE7030)
+    # bomb = False
+    # if not blocker:
+    #     bomb = rng.randint(1, 4) % 4 == 0
+
+    total_count = entity_count
+    if blocker:
+        total_count += 1
+        entities.append(BLOCKER)
+
+    # UNCOMMENT THIS FOR TASK 3 (CSSE7030)
+    # if bomb:
+    #     total_count += 1
+    #     entities.append(BOMB)
+
+    entity_index = rng.sample(range(size), total_count)
+    return list(zip(entity_index, entities))
+
+
+class Game:
+    '''The Game handles the logic for controlling the actions of the entities within the grid.'''
+    def __init__(self, size: int, grid_type: type = Grid, seed: Optional[int] = None) -> None:
+        '''
+        A game is constructed with a size representing the dimensions of the playing grid.
+        
+        Parameters:
+            size: A size representing the dimensions of the playing grid.
+            grid_type: The Grid class used to store the board, e.g. ArrayGrid.
+            seed: The seed of the game's own random stream. A seed is drawn
+                from the random module if none is given.
+        '''
+        if seed is None:
+            seed = random.getrandbits(64)
+        self._seed = seed
+        self._rng = random.Random(seed)
+        self._grid: Grid = grid_type(size)
+        self._collected = 0
+        self._destroyed = 0
+        self._total_shots = 0
+    
+    def get_seed(self) -> int:
+        '''Return the seed of the game's random stream.'''
+        return self._seed
+
+    def get_grid(self) -> Grid:
+        '''Return the instance of the grid held by the game.'''
+        return self._grid
+
+    def copy(self) -> "Game":
+        '''
+        Return an independent copy of this game, with its own copy of the
+        grid, counters and random stream.
+        '''
+        game = self.__class__.__new__(self.__class__)
+        game.__dict__.update(self.__dict__)
+        game._grid = self._grid.copy()
+        game._rng = random.Random()
+        game._rng.setstate(self._rng.getstate())
+        return game
+
+    def get_player_position(self) -> Position:
+        '''Return the position of the player in the grid (top row, centre column).'''
+        size = self._grid.get_size()
+        return get_position_table(size).get(size // 2, 0)
+
+    def get_num_collected(self) -> int:
+        '''Return the total of Collectables acquired.'''
+        return self._collected
+
+    def get_num_destroyed(self) -> int:
+        '''Return the total of Destroyables removed with a shot.'''
+        return self._destroyed
+
+    def get_total_shots(self) -> int:
+        '''Return the total of shots taken.'''
+        return self._total_shots
+
+    def set_counts(self, collected: int, destroyed: int, total_shots: int) -> None:
+        '''
+        Set the shot counters, e.g. when a saved game is loaded.
+
+        Parameters:
+            collected: The total of Collectables acquired.
+            destroyed: The total of Destroyables removed with a shot.
+            total_shots: The total of shots taken.
+        '''
+        self._collected = collected
+        self._destroyed = destroyed
+        self._total_shots = total_shots
+
+    def rotate_grid(self, direction: str) -> None:
+        '''
+        Rotate the positions of the entities within the grid depending on the direction they are being rotated.
+        
+        Parameters:
+            direction: The rotation direction of the entities' positions.
+        '''
+        self._grid.rotate(direction)
+        
+    def apply_action(self, action: int) -> None:
+        '''
+        Rotate the grid, fire or do nothing as given by one of ACTIONS.
+
+        Parameters:
+            action: The action to take.
+        '''
+        if action == ROTATE_LEFT_ACTION:
+            self.rotate_grid(LEFT)
+        elif action == ROTATE_RIGHT_ACTION:
+            self.rotate_grid(RIGHT)
+        elif action == FIRE_COLLECT_ACTION:
+            self.fire(COLLECT)
+        elif action == FIRE_DESTROY_ACTION:
+            self.fire(DESTROY)
+        elif action != NO_ACTION:
+            raise ValueError(f"unknown action {action!r}")
+
+    def _create_entity(self, display: str) -> Entity:
+        '''
+        Uses a display character to get the shared Entity of that type.
+
+        Parameters:
+            display: The entities' display.
+        '''
+        if display not in ENTITY_INSTANCES:
+            raise NotImplementedError()
+        return ENTITY_INSTANCES[display]
+
+    def generate_entities(self) -> None:
+        """
+        Method given to the students to generate a random amount of entities to
+        add into the game after each step.
+        """
+        # Add entities into grid
+        positions = get_position_table(self.get_grid().get_size())
+        for pos, entity in generate_spawn_row(self._rng, self.get_grid().get_size()):
+            position = positions.get(pos, self.get_grid().get_size() - 1)
+            new_entity = self._create_entity(entity)
+            self.get_grid().add_entity(position, new_entity)
+          
+    def step(self) -> None:
+        '''This method moves all entities on the board by an offset of (0, -1).'''
+        self._grid.scroll()
+        self.generate_entities()
+
+    def fire(self, shot_type: str) -> None:
+        '''
+        Handles the firing/collecting actions of a player towards an entity within the grid.
+        
+        Parameters:
+            shot_type: The type of bomb.
+        '''
+        position = self._grid.get_nearest_in_column(self.get_player_position().get_x())
+        if position is None:
+            return
+        entity = self._grid.get_entity(position)
+
+        # Shoot the corresponding entity according to the bullet type and clear the bullet.
+        if entity.display() == COLLECTABLE and shot_type == SHOT_TYPES[1]:
+            self._grid.remove_entity(position)
+            self._collected += 1
+            self._total_shots += 1
+
+        elif entity.display() == DESTROYABLE and shot_type == SHOT_TYPES[0]:
+            self._grid.remove_entity(position)
+            self._destroyed += 1
+            self._total_shots += 1
+
+        elif entity.display() == BOMB:
+            self._grid.remove_entity(position)
+
+    def has_won(self) -> bool:
+        '''Return True if the player has won the game.'''
+        if self.get_num_collected() == COLLECTION_TARGET:
+            return True
+        else:
+            return False
+
+    def has_lost(self) -> bool:
+        '''Returns True if the game is lost (a Destroyable has reached the top row).'''
+        return self.get_grid().get_destroyables_in_row(1) > 0
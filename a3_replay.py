@@ -0,0 +1,239 @@
+'''
+Replay logs for Hacker games.
+
+Because every Game draws its spawns from its own seeded random stream, the
+seed plus the stream of rotate, fire and step inputs is enough to rebuild
+every frame of a game. A replay file holds:
+
+    header  magic b'HKRP', format version (uint16), grid size (uint32),
+            seed (uint64), number of events (uint64)
+    times   one uint32 per event, milliseconds since the game started
+    events  one byte per event, see EVENTS
+
+All integers are little-endian. Run `python a3_replay.py <file>` to re-run a
+replay headlessly at full speed.
+'''
+import argparse
+import struct
+import sys
+import time
+from array import array
+from typing import Iterator, Optional, Tuple
+
+from a3_support import *
+from a3_model import GRID_TYPES, Game, Grid
+
+ROTATE_LEFT_EVENT = 0
+ROTATE_RIGHT_EVENT = 1
+FIRE_COLLECT_EVENT = 2
+FIRE_DESTROY_EVENT = 3
+STEP_EVENT = 4
+
+# The Game method and argument each event code replays.
+EVENTS = {ROTATE_LEFT_EVENT: ('rotate_grid', LEFT),
+          ROTATE_RIGHT_EVENT: ('rotate_grid', RIGHT),
+          FIRE_COLLECT_EVENT: ('fire', COLLECT),
+          FIRE_DESTROY_EVENT: ('fire', DESTROY),
+          STEP_EVENT: ('step', None)}
+ROTATE_EVENTS = {LEFT: ROTATE_LEFT_EVENT, RIGHT: ROTATE_RIGHT_EVENT}
+FIRE_EVENTS = {COLLECT: FIRE_COLLECT_EVENT, DESTROY: FIRE_DESTROY_EVENT}
+
+REPLAY_MAGIC = b'HKRP'
+REPLAY_VERSION = 1
+HEADER = struct.Struct('<4sHIQQ')
+
+
+class ReplayLog:
+    '''A ReplayLog holds the size and seed of a game and its timestamped inputs.'''
+    def __init__(self, size: int, seed: int) -> None:
+        '''
+        A replay log is constructed from the size and seed of the game.
+
+        Parameters:
+            size: The size of the game's grid.
+            seed: The seed of the game's random stream.
+        '''
+        self._size = size
+        self._seed = seed
+        self._times = array('I')
+        self._events = bytearray()
+
+    def get_size(self) -> int:
+        '''Return the size of the game's grid.'''
+        return self._size
+
+    def get_seed(self) -> int:
+        '''Return the seed of the game's random stream.'''
+        return self._seed
+
+    def get_events(self) -> Iterator[Tuple[int, int]]:
+        '''Return an iterator of (milliseconds, event code) pairs in the order recorded.'''
+        return zip(self._times, self._events)
+
+    def __len__(self) -> int:
+        '''Return the number of recorded events.'''
+        return len(self._events)
+
+    def record(self, time_ms: int, event: int) -> None:
+        '''
+        Append an event to the log.
+
+        Parameters:
+            time_ms: Milliseconds since the game started.
+            event: The event code, one of the keys of EVENTS.
+        '''
+        self._times.append(time_ms)
+        self._events.append(event)
+
+    def save(self, filename: str) -> None:
+        '''
+        Write the log to a replay file.
+
+        Parameters:
+            filename: The path of the replay file.
+        '''
+        times = array('I', self._times)
+        if sys.byteorder == 'big':
+            times.byteswap()
+        with open(filename, 'wb') as f:
+            f.write(HEADER.pack(REPLAY_MAGIC, REPLAY_VERSION, self._size,
+                                self._seed, len(self._events)))
+            f.write(times.tobytes())
+            f.write(self._events)
+
+    @classmethod
+    def load(cls, filename: str) -> "ReplayLog":
+        '''
+        Read a log from a replay file.
+
+        Parameters:
+            filename: The path of the replay file.
+
+        Raises:
+            ValueError: If the file is not a valid replay file.
+        '''
+        with open(filename, 'rb') as f:
+            data = f.read()
+        if len(data) < HEADER.size:
+            raise ValueError("not a Hacker replay file")
+        magic, version, size, seed, count = HEADER.unpack_from(data, 0)
+        if magic != REPLAY_MAGIC:
+            raise ValueError("not a Hacker replay file")
+        if version != REPLAY_VERSION:
+            raise ValueError(f"unsupported replay version {version}")
+        times_size = count * array('I').itemsize
+        if len(data) != HEADER.size + times_size + count:
+            raise ValueError("replay file has the wrong length")
+        log = cls(size, seed)
+        log._times.frombytes(data[HEADER.size:HEADER.size + times_size])
+        if sys.byteorder == 'big':
+            log._times.byteswap()
+        log._events[:] = data[HEADER.size + times_size:]
+        if any(event not in EVENTS for event in set(log._events)):
+            raise ValueError("replay file has an unknown event")
+        return log
+
+
+class RecordingGame(Game):
+    '''A Game that records every rotate, fire and step in a ReplayLog.'''
+    def __init__(self, size: int, grid_type: type = Grid, seed: Optional[int] = None) -> None:
+        '''
+        A recording game is constructed like a Game.
+
+        Parameters:
+            size: A size representing the dimensions of the playing grid.
+            grid_type: The Grid class used to store the board.
+            seed: The seed of the game's own random stream.
+        '''
+        super().__init__(size, grid_type, seed)
+        self._log = ReplayLog(size, self.get_seed())
+        self._start = time.monotonic()
+
+    def get_log(self) -> ReplayLog:
+        '''Return the replay log of this game.'''
+        return self._log
+
+    def _record(self, event: int) -> None:
+        '''
+        Record an event at the current time.
+
+        Parameters:
+            event: The event code.
+        '''
+        self._log.record(int((time.monotonic() - self._start) * 1000), event)
+
+    def rotate_grid(self, direction: str) -> None:
+        '''
+        Record the rotation, then rotate the grid.
+
+        Parameters:
+            direction: The rotation direction of the entities' positions.
+        '''
+        self._record(ROTATE_EVENTS[direction])
+        super().rotate_grid(direction)
+
+    def fire(self, shot_type: str) -> None:
+        '''
+        Record the shot, then fire it.
+
+        Parameters:
+            shot_type: The type of shot, COLLECT or DESTROY.
+        '''
+        self._record(FIRE_EVENTS[shot_type])
+        super().fire(shot_type)
+
+    def step(self) -> None:
+        '''Record the step, then move the entities.'''
+        self._record(STEP_EVENT)
+        super().step()
+
+
+def run_replay(log: ReplayLog, grid_type: type = Grid, until: Optional[int] = None) -> Game:
+    '''
+    Re-run a replay log headlessly and return the resulting game.
+
+    Parameters:
+        log: The replay log to run.
+        grid_type: The Grid class used to store the board.
+        until: If given, stop before the first event later than this many
+            milliseconds, giving the frame shown at that time.
+    '''
+    game = Game(log.get_size(), grid_type, log.get_seed())
+    for time_ms, event in log.get_events():
+        if until is not None and time_ms > until:
+            break
+        method, argument = EVENTS[event]
+        if argument is None:
+            getattr(game, method)()
+        else:
+            getattr(game, method)(argument)
+    return game
+
+
+def main(argv=None) -> None:
+    '''Re-run a replay file from the command line and print its outcome.'''
+    parser = argparse.ArgumentParser(description="Re-run a Hacker replay file headlessly.")
+    parser.add_argument('replay', help="path of the replay file")
+    parser.add_argument('--until', type=int, default=None,
+                        help="stop at this many milliseconds into the game")
+    parser.add_argument('--grid', choices=sorted(GRID_TYPES), default='ScrollingGrid',
+                        help="grid backend to replay on")
+    args = parser.parse_args(argv)
+
+    log = ReplayLog.load(args.replay)
+    start = time.perf_counter()
+    game = run_replay(log, GRID_TYPES[args.grid], args.until)
+    elapsed = time.perf_counter() - start
+    print(f"events: {len(log)} in {elapsed:.3f}s")
+    print(f"collected: {game.get_num_collected()}")
+    print(f"destroyed: {game.get_num_destroyed()}")
+    print(f"total shots: {game.get_total_shots()}")
+    print(f"won: {game.has_won()}, lost: {game.has_lost()}")
+    size = game.get_grid().get_size()
+    cells = game.get_grid().serialise()
+    for y in range(size):
+        print(''.join(cells.get((x, y), '.') for x in range(size)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,179 @@
+'''
+Versioned binary save files for Hacker games.
+
+A save file is a header, the packed cell array and then the counters:
+
+    header    magic b'HACK', format version (uint16), grid size (uint32)
+    cells     size * size bytes, one CELL_CODES entry per cell, row by row
+    counters  collected, destroyed, game total shots, fired shots and the
+              timer in seconds, each an int64
+
+All integers are little-endian. Files are written atomically, holding only
+the occupied cells in memory, and read back through a memory map one row at a
+time. Text saves from earlier versions of the game can still be loaded, and
+are parsed with ast.literal_eval rather than eval.
+'''
+import ast
+import mmap
+import os
+import struct
+import tempfile
+from typing import Dict, Tuple
+
+from a3_support import *
+from a3_model import CELL_CODES, CELL_ENTITIES, EMPTY_CELL, ENTITY_INSTANCES, Game
+
+SAVE_MAGIC = b'HACK'
+SAVE_VERSION = 1
+HEADER = struct.Struct('<4sHI')
+COUNTERS = struct.Struct('<5q')
+
+
+def write_save(filename: str, game: Game, fired_shots: int, time: int) -> None:
+    '''
+    Atomically write a game to a binary save file.
+
+    Parameters:
+        filename: The path of the save file.
+        game: The game to save.
+        fired_shots: The number of shots fired, as shown by the StatusBar.
+        time: The timer of the game in seconds.
+    '''
+    grid = game.get_grid()
+    size = grid.get_size()
+
+    # Group the occupied cells by row so that rows can be written in order.
+    rows: Dict[int, Dict[int, int]] = {}
+    for position, entity in grid.get_entities_view().items():
+        rows.setdefault(position.get_y(), {})[position.get_x()] = CELL_CODES[entity.display()]
+
+    directory = os.path.dirname(os.path.abspath(filename))
+    descriptor, temporary = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    try:
+        with os.fdopen(descriptor, 'wb') as f:
+            f.write(HEADER.pack(SAVE_MAGIC, SAVE_VERSION, size))
+            empty_row = bytes(size)
+            row = bytearray(size)
+            for y in range(size):
+                cells = rows.get(y)
+                if cells is None:
+                    f.write(empty_row)
+                    continue
+                row[:] = empty_row
+                for x, code in cells.items():
+                    row[x] = code
+                f.write(row)
+            f.write(COUNTERS.pack(game.get_num_collected(), game.get_num_destroyed(),
+                                  game.get_total_shots(), fired_shots, time))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temporary, filename)
+    except BaseException:
+        os.unlink(temporary)
+        raise
+
+
+def read_save(filename: str, game: Game) -> Tuple[int, int]:
+    '''
+    Load a save file into a new game of the same size and return the number
+    of fired shots and the timer. Binary saves are read through a memory
+    map; anything else is read as an old text save.
+
+    Parameters:
+        filename: The path of the save file.
+        game: A new game to load the entities and counters into.
+
+    Raises:
+        ValueError: If the file is not a valid save for a grid of this size.
+    '''
+    with open(filename, 'rb') as f:
+        if f.read(len(SAVE_MAGIC)) != SAVE_MAGIC:
+            return _read_text_save(filename, game)
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            return _read_binary_save(data, game)
+
+
+def _read_binary_save(data: mmap.mmap, game: Game) -> Tuple[int, int]:
+    '''
+    Load a binary save from a memory map into a game.
+
+    Parameters:
+        data: The memory mapped save file.
+        game: A new game to load the entities and counters into.
+    '''
+    if len(data) < HEADER.size:
+        raise ValueError("save file is truncated")
+    _, version, size = HEADER.unpack_from(data, 0)
+    if version != SAVE_VERSION:
+        raise ValueError(f"unsupported save version {version}")
+    grid = game.get_grid()
+    if size != grid.get_size():
+        raise ValueError(f"save is for a {size}x{size} grid")
+    if len(data) != HEADER.size + size * size + COUNTERS.size:
+        raise ValueError("save file has the wrong length")
+
+    positions = get_position_table(size)
+    empty_row = bytes(size)
+    offset = HEADER.size
+    for y in range(size):
+        row = data[offset:offset + size]
+        offset += size
+        if row == empty_row or y == 0:
+            continue
+        for x, code in enumerate(row):
+            if code != EMPTY_CELL:
+                if code not in CELL_ENTITIES:
+                    raise ValueError(f"unknown cell code {code}")
+                grid.add_entity(positions.get(x, y), CELL_ENTITIES[code])
+
+    collected, destroyed, total_shots, fired_shots, time = COUNTERS.unpack_from(data, offset)
+    game.set_counts(collected, destroyed, total_shots)
+    return fired_shots, time
+
+
+def _read_text_save(filename: str, game: Game) -> Tuple[int, int]:
+    '''
+    Load an old text save, which holds the serialised grid followed by the
+    collected, destroyed, fired shots and timer counters, one per line.
+
+    Parameters:
+        filename: The path of the save file.
+        game: A new game to load the entities and counters into.
+    '''
+    with open(filename, 'r', encoding='utf-8') as f:
+        lines = f.readlines()
+    if len(lines) != 5:
+        raise ValueError("not a Hacker save file")
+    field_string, collected, destroyed, fired_shots, time = lines
+    try:
+        field: Dict[Tuple[int, int], str] = ast.literal_eval(field_string)
+    except (SyntaxError, ValueError, TypeError, MemoryError, RecursionError):
+        raise ValueError("not a Hacker save file")
+    if not _is_serialised_grid(field):
+        raise ValueError("not a Hacker save file")
+    grid = game.get_grid()
+    for (x, y), display in field.items():
+        if display not in ENTITY_INSTANCES:
+            raise ValueError(f"unknown entity {display!r}")
+        if display != PLAYER:
+            grid.add_entity(Position(x, y), ENTITY_INSTANCES[display])
+    game.set_counts(int(collected), int(destroyed), 0)
+    return int(fired_shots), int(time)
+
+
+def _is_serialised_grid(field: object) -> bool:
+    '''
+    Return whether a literal has the shape of Grid.serialise: a dictionary
+    mapping (x, y) tuples of integers to display strings.
+
+    Parameters:
+        field: The literal read from a text save.
+    '''
+    if not isinstance(field, dict):
+        return False
+    for key, display in field.items():
+        if not isinstance(key, tuple) or len(key) != 2 or not isinstance(display, str):
+            return False
+        if not all(isinstance(value, int) and not isinstance(value, bool) for value in key):
+            return False
+    return True
@@ -0,0 +1,312 @@
+'''
+Timing for the Hacker controllers: the TickScheduler that drives all periodic
+work and the TickProfiler that records where a frame's time went. Neither
+needs tkinter; the scheduler only calls after() and after_cancel() on its
+master widget.
+'''
+import math
+import time
+from array import array
+
+from a3_support import *
+
+class TimingHistogram(object):
+    '''
+    TimingHistogram counts durations in a fixed number of buckets, so
+    recording costs the same and uses no more memory however long it runs.
+    Bucket 0 holds durations under 1 microsecond and bucket i those in
+    [2 ** (i - 1), 2 ** i) microseconds; the last bucket also holds anything
+    longer.
+    '''
+    def __init__(self, buckets: int = PROFILE_BUCKETS) -> None:
+        '''
+        The TimingHistogram class is constructed from the number of buckets.
+
+        Parameters:
+            buckets: The number of buckets.
+        '''
+        self._buckets = array('Q', bytes(8 * buckets))
+        self._count = 0
+        self._total = 0.0
+        self._max = 0.0
+
+    def record(self, seconds: float) -> None:
+        '''
+        Add one duration to the histogram.
+
+        Parameters:
+            seconds: The duration in seconds.
+        '''
+        bucket = int(seconds * 1000000).bit_length() if seconds > 0 else 0
+        self._buckets[min(bucket, len(self._buckets) - 1)] += 1
+        self._count += 1
+        self._total += seconds
+        if seconds > self._max:
+            self._max = seconds
+
+    def get_count(self) -> int:
+        '''Return the number of recorded durations.'''
+        return self._count
+
+    def get_buckets(self) -> List[int]:
+        '''Return the count in each bucket.'''
+        return self._buckets.tolist()
+
+    def get_mean(self) -> float:
+        '''Return the mean duration in milliseconds.'''
+        return self._total * 1000 / self._count if self._count else 0.0
+
+    def get_max(self) -> float:
+        '''Return the longest duration in milliseconds.'''
+        return self._max * 1000
+
+    def get_percentile(self, fraction: float) -> float:
+        '''
+        Return an upper bound in milliseconds on the given fraction of the
+        durations, accurate to a factor of two.
+
+        Parameters:
+            fraction: The fraction of the durations, e.g. 0.99.
+        '''
+        if not self._count:
+            return 0.0
+        wanted = fraction * self._count
+        seen = 0
+        for bucket, count in enumerate(self._buckets):
+            seen += count
+            if seen >= wanted:
+                return min((1 << bucket) / 1000, self.get_max())
+        return self.get_max()
+
+    def clear(self) -> None:
+        '''Forget every recorded duration.'''
+        for bucket in range(len(self._buckets)):
+            self._buckets[bucket] = 0
+        self._count = 0
+        self._total = 0.0
+        self._max = 0.0
+
+
+class TickProfiler(object):
+    '''
+    TickProfiler keeps one TimingHistogram for each of the PROFILE_SECTIONS:
+    time spent in game logic, time spent drawing and how late the scheduler
+    ran each tick.
+    '''
+    def __init__(self) -> None:
+        '''The TickProfiler class is constructed with empty histograms.'''
+        self._histograms = {section: TimingHistogram() for section in PROFILE_SECTIONS}
+
+    def record(self, section: str, seconds: float) -> None:
+        '''
+        Add one duration to a section.
+
+        Parameters:
+            section: One of PROFILE_SECTIONS.
+            seconds: The duration in seconds.
+        '''
+        self._histograms[section].record(seconds)
+
+    def get_histogram(self, section: str) -> TimingHistogram:
+        '''
+        Return the histogram of a section.
+
+        Parameters:
+            section: One of PROFILE_SECTIONS.
+        '''
+        return self._histograms[section]
+
+    def summary(self) -> str:
+        '''Return a one-line summary of the median and 99th percentile of each section.'''
+        return " | ".join(f"{section} p50 {histogram.get_percentile(0.5):.2f}ms "
+                          f"p99 {histogram.get_percentile(0.99):.2f}ms"
+                          for section, histogram in self._histograms.items())
+
+    def dump(self, filename: str) -> None:
+        '''
+        Write every histogram to a JSON file.
+
+        Parameters:
+            filename: The path of the file.
+        '''
+        import json
+        report = {section: {'count': histogram.get_count(),
+                            'mean_ms': histogram.get_mean(),
+                            'max_ms': histogram.get_max(),
+                            'p50_ms': histogram.get_percentile(0.5),
+                            'p99_ms': histogram.get_percentile(0.99),
+                            'buckets_us': histogram.get_buckets()}
+                  for section, histogram in self._histograms.items()}
+        with open(filename, 'w', encoding = 'utf-8') as f:
+            json.dump(report, f, indent = 2)
+
+    def clear(self) -> None:
+        '''Forget every recorded duration.'''
+        for histogram in self._histograms.values():
+            histogram.clear()
+
+
+class TickScheduler(object):
+    '''
+    TickScheduler owns all periodic work of a controller and drives it from a
+    single pending after() callback.
+
+    Each subscription runs on a fixed timestep of game time. Due times are
+    absolute, so time spent in callbacks or late wake-ups never accumulates
+    as drift. A subscription that falls behind runs up to MAX_CATCH_UP_TICKS
+    missed ticks at once and skips the rest. Game time stops while paused and
+    runs at a variable speed relative to wall time.
+    '''
+    def __init__(self, master, clock = time.monotonic) -> None:
+        '''
+        The TickScheduler class is constructed from the master.
+
+        Parameters:
+            master: The widget whose after() drives the scheduler.
+            clock: A function returning the wall time in seconds.
+        '''
+        self._master = master
+        self._clock = clock
+        # Subscription id -> [interval (ms), callback, next due game time (ms)].
+        self._subscriptions: Dict[int, list] = {}
+        self._next_id = 0
+        self._game_time = 0.0
+        self._last_wall = clock()
+        self._speed = 1.0
+        self._paused = False
+        self._after_id = None
+        self._profiler: Optional[TickProfiler] = None
+
+    def set_profiler(self, profiler: Optional[TickProfiler]) -> None:
+        '''
+        Record how late each tick runs in a profiler, or stop recording.
+
+        Parameters:
+            profiler: The profiler, or None.
+        '''
+        self._profiler = profiler
+
+    def subscribe(self, interval: int, callback) -> int:
+        '''
+        Run a callback every interval milliseconds of game time and return
+        the subscription id used to cancel it.
+
+        Parameters:
+            interval: The period of the callback in milliseconds.
+            callback: The function to call.
+        '''
+        self._advance()
+        subscription = self._next_id
+        self._next_id += 1
+        self._subscriptions[subscription] = [interval, callback, self._game_time + interval]
+        self._schedule()
+        return subscription
+
+    def cancel(self, subscription: int) -> None:
+        '''
+        Stop a subscription. Cancelling twice has no effect.
+
+        Parameters:
+            subscription: The id returned by subscribe.
+        '''
+        self._advance()
+        self._subscriptions.pop(subscription, None)
+        self._schedule()
+
+    def cancel_all(self) -> None:
+        '''Stop every subscription.'''
+        self._advance()
+        self._subscriptions.clear()
+        self._schedule()
+
+    def pause(self) -> None:
+        '''Stop game time.'''
+        self._advance()
+        self._paused = True
+        self._schedule()
+
+    def resume(self) -> None:
+        '''Restart game time after a pause.'''
+        self._advance()
+        self._paused = False
+        self._schedule()
+
+    def is_paused(self) -> bool:
+        '''Return whether game time is stopped.'''
+        return self._paused
+
+    def set_speed(self, speed: float) -> None:
+        '''
+        Set how fast game time runs relative to wall time.
+
+        Parameters:
+            speed: The speed factor, e.g. 2 for double speed.
+        '''
+        if speed <= 0:
+            raise ValueError("speed must be positive")
+        self._advance()
+        self._speed = speed
+        self._schedule()
+
+    def get_speed(self) -> float:
+        '''Return the speed of game time relative to wall time.'''
+        return self._speed
+
+    def get_time(self) -> float:
+        '''Return the game time in milliseconds.'''
+        self._advance()
+        return self._game_time
+
+    def restart(self) -> None:
+        '''Reset game time to zero, resume and restart the period of every subscription.'''
+        self._game_time = 0.0
+        self._last_wall = self._clock()
+        self._paused = False
+        for subscription in self._subscriptions.values():
+            subscription[2] = subscription[0]
+        self._schedule()
+
+    def _advance(self) -> None:
+        '''Advance game time to the current wall time.'''
+        now = self._clock()
+        if not self._paused:
+            self._game_time += (now - self._last_wall) * 1000 * self._speed
+        self._last_wall = now
+
+    def _schedule(self) -> None:
+        '''Replace the pending after() callback with one for the next due subscription.'''
+        if self._after_id is not None:
+            self._master.after_cancel(self._after_id)
+            self._after_id = None
+        if self._paused or not self._subscriptions:
+            return
+        next_due = min(subscription[2] for subscription in self._subscriptions.values())
+        delay = max(0, math.ceil((next_due - self._game_time) / self._speed))
+        self._after_id = self._master.after(delay, self._run)
+
+    def _run(self) -> None:
+        '''Run every subscription that is due, catching up on missed ticks.'''
+        self._after_id = None
+        self._advance()
+        due_order = sorted(self._subscriptions, key = lambda key: self._subscriptions[key][2])
+        for key in due_order:
+            ticks = 0
+            while not self._paused:
+                subscription = self._subscriptions.get(key)
+                if subscription is None or subscription[2] > self._game_time:
+                    break
+                interval = subscription[0]
+                if ticks == MAX_CATCH_UP_TICKS:
+                    # Too far behind: skip the remaining missed ticks.
+                    missed = (self._game_time - subscription[2]) // interval + 1
+                    subscription[2] += missed * interval
+                    break
+                if self._profiler is not None:
+                    lateness = (self._game_time - subscription[2]) / self._speed / 1000
+                    self._profiler.record(LATENESS_SECTION, lateness)
+                subscription[2] += interval
+                ticks += 1
+                subscription[1]()
+        # The callbacks took time: schedule from the time they finished.
+        self._advance()
+        self._schedule()
@@ -0,0 +1,331 @@
+'''
+Monte Carlo simulation of headless Hacker games.
+
+Plays many games with a policy from POLICIES, spread over a process pool.
+Each game gets its own seed, drawn from one master seed, so a run gives the
+same outcomes whatever the number of workers. Outcomes are streamed back as
+games finish and aggregated into a summary of ticks survived, collected,
+destroyed, total shots and win/loss rates.
+
+Examples:
+    python a3.py simulate --games 10000 --policy greedy
+    python a3_simulate.py --games 500 --policy random --outcomes games.csv
+'''
+import argparse
+import csv
+import json
+import math
+import multiprocessing
+import os
+import random
+import sys
+import time
+from typing import Callable, Dict, Iterator, NamedTuple, Optional, Sequence
+
+from a3_support import *
+from a3_model import GRID_TYPES, Game
+from a3_bot import expectimax_policy
+
+DEFAULT_MAX_TICKS = 1000
+
+# Policy name -> function choosing one of ACTIONS from a game, a random
+# stream, the number of actions already taken since the last step, the
+# number of actions between two steps and the Collectables needed to win. Workers look policies up by name, so a
+# policy registered outside this module is only seen by workers that import
+# the registering module.
+POLICIES: Dict[str, Callable[[Game, random.Random, int, int, int], int]] = {}
+
+
+def register_policy(name: str) -> Callable:
+    '''
+    Return a decorator that adds a policy to POLICIES under a name.
+
+    Parameters:
+        name: The name used to choose the policy, e.g. on the command line.
+    '''
+    def register(policy: Callable[[Game, random.Random, int, int, int], int]
+                 ) -> Callable[[Game, random.Random, int, int, int], int]:
+        POLICIES[name] = policy
+        return policy
+    return register
+
+
+@register_policy('idle')
+def idle_policy(game: Game, rng: random.Random, phase: int, actions_per_step: int,
+                target: int) -> int:
+    '''Never act, giving the baseline number of ticks before a loss.'''
+    return NO_ACTION
+
+
+@register_policy('random')
+def random_policy(game: Game, rng: random.Random, phase: int, actions_per_step: int,
+                  target: int) -> int:
+    '''Choose any action uniformly at random.'''
+    return rng.choice(ACTIONS)
+
+
+@register_policy('greedy')
+def greedy_policy(game: Game, rng: random.Random, phase: int, actions_per_step: int,
+                  target: int) -> int:
+    '''
+    Shoot the nearest entity in the player's column with the matching shot.
+    Otherwise rotate towards the column whose nearest entity is the closest
+    Destroyable, or failing that the closest Collectable.
+    '''
+    grid = game.get_grid()
+    size = grid.get_size()
+    player_x = game.get_player_position().get_x()
+    target = grid.get_nearest_in_column(player_x)
+    if target is not None:
+        display = grid.get_entity(target).display()
+        if display == COLLECTABLE:
+            return FIRE_COLLECT_ACTION
+        if display == DESTROYABLE:
+            return FIRE_DESTROY_ACTION
+
+    best = None
+    for x in range(size):
+        nearest = grid.get_nearest_in_column(x)
+        if nearest is None or x == player_x:
+            continue
+        display = grid.get_entity(nearest).display()
+        if display not in ENTITY_TYPES:
+            continue
+        # Rotating LEFT moves the column to the right of the player onto it.
+        distance = (x - player_x) % size
+        turns = min(distance, size - distance)
+        rank = (display != DESTROYABLE, nearest.get_y(), turns)
+        if best is None or rank < best[0]:
+            best = (rank, ROTATE_LEFT_ACTION if distance <= size // 2 else ROTATE_RIGHT_ACTION)
+    return NO_ACTION if best is None else best[1]
+
+
+register_policy('expectimax')(expectimax_policy)
+
+
+class Outcome(NamedTuple):
+    '''The result of one simulated game.'''
+    seed: int
+    ticks: int
+    collected: int
+    destroyed: int
+    total_shots: int
+    won: bool
+    lost: bool
+
+
+class SessionConfig(NamedTuple):
+    '''The settings shared by every game of a simulation.'''
+    policy: str = 'greedy'
+    size: int = GRID_SIZE
+    grid: str = 'ScrollingGrid'
+    max_ticks: int = DEFAULT_MAX_TICKS
+    target: int = COLLECTION_TARGET
+    actions_per_step: int = 1
+
+
+def play_session(seed: int, config: SessionConfig) -> Outcome:
+    '''
+    Play one headless game until it is won, lost or reaches max_ticks steps.
+
+    Parameters:
+        seed: The seed of the game, also used for the policy's random choices.
+        config: The settings of the simulation.
+    '''
+    policy = POLICIES[config.policy]
+    game = Game(config.size, GRID_TYPES[config.grid], seed)
+    rng = random.Random(seed ^ 0x5DEECE66D)
+    ticks = 0
+    won = lost = False
+    while ticks < config.max_ticks:
+        for phase in range(config.actions_per_step):
+            game.apply_action(policy(game, rng, phase, config.actions_per_step, config.target))
+            # The game is won as soon as the target is reached.
+            if game.get_num_collected() >= config.target:
+                won = True
+                break
+        if won:
+            break
+        game.step()
+        ticks += 1
+        if game.has_lost():
+            lost = True
+            break
+    return Outcome(seed, ticks, game.get_num_collected(), game.get_num_destroyed(),
+                   game.get_total_shots(), won, lost)
+
+
+def _play_seed(task) -> Outcome:
+    '''Play the game of a (seed, config) task in a worker process.'''
+    return play_session(*task)
+
+
+def simulate(games: int, config: SessionConfig, seed: int = 0,
+             workers: Optional[int] = None) -> Iterator[Outcome]:
+    '''
+    Yield the outcome of each game as it finishes, in no particular order.
+
+    Parameters:
+        games: The number of games to play.
+        config: The settings of the simulation.
+        seed: The master seed the seed of every game is drawn from.
+        workers: The number of worker processes. Defaults to every core;
+            1 plays the games in this process.
+    '''
+    master = random.Random(seed)
+    tasks = ((master.getrandbits(64), config) for _ in range(games))
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        yield from map(_play_seed, tasks)
+        return
+    chunksize = max(1, min(64, games // (workers * 8)))
+    with multiprocessing.Pool(workers) as pool:
+        yield from pool.imap_unordered(_play_seed, tasks, chunksize)
+
+
+class RunningStats:
+    '''RunningStats keeps the count, mean, variance and range of a stream of numbers.'''
+    def __init__(self) -> None:
+        '''Running stats are constructed empty.'''
+        self._count = 0
+        self._mean = 0.0
+        self._squares = 0.0
+        self._min = math.inf
+        self._max = -math.inf
+
+    def add(self, value: float) -> None:
+        '''
+        Add a value, using Welford's update so the variance stays accurate.
+
+        Parameters:
+            value: The value to add.
+        '''
+        self._count += 1
+        delta = value - self._mean
+        self._mean += delta / self._count
+        self._squares += delta * (value - self._mean)
+        self._min = min(self._min, value)
+        self._max = max(self._max, value)
+
+    def get_count(self) -> int:
+        '''Return the number of values added.'''
+        return self._count
+
+    def get_mean(self) -> float:
+        '''Return the mean of the values.'''
+        return self._mean
+
+    def get_stdev(self) -> float:
+        '''Return the sample standard deviation of the values.'''
+        return math.sqrt(self._squares / (self._count - 1)) if self._count > 1 else 0.0
+
+    def to_dict(self) -> Dict[str, float]:
+        '''Return the statistics as a dictionary.'''
+        return {'mean': self._mean, 'stdev': self.get_stdev(),
+                'min': self._min if self._count else 0, 'max': self._max if self._count else 0}
+
+
+class OutcomeSummary:
+    '''OutcomeSummary aggregates the outcomes of a simulation as they arrive.'''
+    FIELDS = ('ticks', 'collected', 'destroyed', 'total_shots')
+
+    def __init__(self) -> None:
+        '''An outcome summary is constructed empty.'''
+        self._stats = {field: RunningStats() for field in self.FIELDS}
+        self._games = 0
+        self._won = 0
+        self._lost = 0
+
+    def add(self, outcome: Outcome) -> None:
+        '''
+        Add the outcome of one game.
+
+        Parameters:
+            outcome: The outcome to add.
+        '''
+        self._games += 1
+        self._won += outcome.won
+        self._lost += outcome.lost
+        for field in self.FIELDS:
+            self._stats[field].add(getattr(outcome, field))
+
+    def get_games(self) -> int:
+        '''Return the number of games added.'''
+        return self._games
+
+    def to_dict(self) -> dict:
+        '''Return the summary as a dictionary.'''
+        games = self._games or 1
+        summary = {'games': self._games, 'win_rate': self._won / games,
+                   'loss_rate': self._lost / games,
+                   'timeout_rate': (self._games - self._won - self._lost) / games}
+        for field, stats in self._stats.items():
+            summary[field] = stats.to_dict()
+        return summary
+
+    def format(self) -> str:
+        '''Return the summary as a table.'''
+        summary = self.to_dict()
+        lines = [f"games: {summary['games']}  won: {summary['win_rate']:.1%}  "
+                 f"lost: {summary['loss_rate']:.1%}  timed out: {summary['timeout_rate']:.1%}",
+                 f"{'':12} {'mean':>9} {'stdev':>9} {'min':>7} {'max':>7}"]
+        for field in self.FIELDS:
+            stats = summary[field]
+            lines.append(f"{field:12} {stats['mean']:9.2f} {stats['stdev']:9.2f} "
+                         f"{stats['min']:7.0f} {stats['max']:7.0f}")
+        return '\n'.join(lines)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    '''Run a simulation from the command line and print its summary.'''
+    parser = argparse.ArgumentParser(prog = "a3.py simulate",
+                                     description = "Play headless Hacker games with a policy.")
+    parser.add_argument('--games', type = int, default = 1000, help = "number of games to play")
+    parser.add_argument('--policy', choices = sorted(POLICIES), default = 'greedy')
+    parser.add_argument('--seed', type = int, default = 0, help = "master seed of the run")
+    parser.add_argument('--workers', type = int, default = None,
+                        help = "worker processes (default: every core)")
+    parser.add_argument('--size', type = int, default = GRID_SIZE)
+    parser.add_argument('--grid', choices = sorted(GRID_TYPES), default = 'ScrollingGrid')
+    parser.add_argument('--max-ticks', type = int, default = DEFAULT_MAX_TICKS,
+                        help = "steps after which a game counts as timed out")
+    parser.add_argument('--target', type = int, default = COLLECTION_TARGET,
+                        help = "Collectables needed to win")
+    parser.add_argument('--actions-per-step', type = int, default = 1,
+                        help = "policy actions between two steps")
+    parser.add_argument('--outcomes', help = "write every game's outcome to this CSV file")
+    parser.add_argument('--json', action = 'store_true', help = "print the summary as JSON")
+    args = parser.parse_args(argv)
+
+    config = SessionConfig(args.policy, args.size, args.grid, args.max_ticks,
+                           args.target, args.actions_per_step)
+    summary = OutcomeSummary()
+    start = time.perf_counter()
+    outcomes_file = open(args.outcomes, 'w', newline = '') if args.outcomes else None
+    try:
+        writer = csv.writer(outcomes_file) if outcomes_file else None
+        if writer:
+            writer.writerow(Outcome._fields)
+        for outcome in simulate(args.games, config, args.seed, args.workers):
+            summary.add(outcome)
+            if writer:
+                writer.writerow(outcome)
+    finally:
+        if outcomes_file:
+            outcomes_file.close()
+    elapsed = time.perf_counter() - start
+
+    if args.json:
+        report = summary.to_dict()
+        report['config'] = config._asdict()
+        report['seed'] = args.seed
+        report['seconds'] = elapsed
+        print(json.dumps(report, indent = 2))
+    else:
+        print(summary.format())
+        print(f"{summary.get_games() / elapsed:.0f} games/s over {elapsed:.2f}s")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,185 @@
+'''
+Pre-scaled sprites for the image mode of the Hacker game.
+
+The entity images are found by searching IMAGE_DIRECTORIES, first next to
+this module and then in the working directory. Scaling them is the slow part
+of starting the image mode. The scaled sprites for every cell size used so far
+are therefore kept in one atlas file:
+
+    header   magic b'HKSP', format version (uint16), SHA-256 of the source
+             images (32 bytes), number of sprites (uint32)
+    sprites  for each sprite: its display character (1 byte), its cell size
+             (uint16), then cell size * cell size RGBA pixels
+
+All integers are little-endian. A later start reads the whole atlas in one
+go. If any source image has changed, its hash no longer matches, and the
+atlas is rebuilt.
+'''
+import hashlib
+import os
+import struct
+import tempfile
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
+
+from PIL import Image
+
+from a3_support import *
+
+ATLAS_MAGIC = b'HKSP'
+ATLAS_VERSION = 1
+HEADER = struct.Struct('<4sH32sI')
+SPRITE_HEADER = struct.Struct('<1sH')
+
+
+def find_image(filename: str) -> str:
+    '''
+    Return the path of an image, searching IMAGE_DIRECTORIES next to this
+    module and then in the working directory.
+
+    Parameters:
+        filename: The file name of the image, e.g. "C.png".
+
+    Raises:
+        FileNotFoundError: If the image is in none of the directories.
+    '''
+    searched = []
+    for base in (os.path.dirname(os.path.abspath(__file__)), os.getcwd()):
+        for directory in IMAGE_DIRECTORIES:
+            path = os.path.join(base, directory, filename)
+            if os.path.isfile(path):
+                return path
+            searched.append(os.path.dirname(path))
+    raise FileNotFoundError(f"{filename} not found in {', '.join(searched)}")
+
+
+def get_cache_directory() -> str:
+    '''Return the directory holding the sprite atlas.'''
+    cache_home = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(cache_home, 'hacker')
+
+
+class SpriteAtlas:
+    '''
+    A SpriteAtlas holds the entity images scaled to each cell size. Sprites
+    are loaded from the atlas file when it matches the source images, and
+    the file is rewritten whenever a new cell size is scaled.
+    '''
+    def __init__(self, filename: Optional[str] = None) -> None:
+        '''
+        A sprite atlas is constructed from the path of its atlas file.
+
+        Parameters:
+            filename: The path of the atlas file. Defaults to SPRITE_ATLAS
+                in the cache directory.
+        '''
+        self._filename = filename or os.path.join(get_cache_directory(), SPRITE_ATLAS)
+        self._sources = {display: find_image(image) for display, image in IMAGES.items()}
+        self._key = self._hash_sources()
+        # (display, cell size) -> raw RGBA pixels.
+        self._pixels: Dict[Tuple[str, int], bytes] = self._read()
+        # Source images decoded so far, by display.
+        self._decoded: Dict[str, Image.Image] = {}
+
+    def _hash_sources(self) -> bytes:
+        '''Return the SHA-256 of the source images, in display character order.'''
+        digest = hashlib.sha256()
+        for display in sorted(self._sources):
+            with open(self._sources[display], 'rb') as f:
+                digest.update(display.encode('ascii'))
+                digest.update(hashlib.sha256(f.read()).digest())
+        return digest.digest()
+
+    def _read(self) -> Dict[Tuple[str, int], bytes]:
+        '''Return the sprites in the atlas file, or none if it is missing, corrupt or stale.'''
+        try:
+            with open(self._filename, 'rb') as f:
+                data = f.read()
+        except OSError:
+            return {}
+        if len(data) < HEADER.size:
+            return {}
+        magic, version, key, count = HEADER.unpack_from(data, 0)
+        if magic != ATLAS_MAGIC or version != ATLAS_VERSION or key != self._key:
+            return {}
+        pixels = {}
+        offset = HEADER.size
+        for _ in range(count):
+            if offset + SPRITE_HEADER.size > len(data):
+                return {}
+            display, cell_size = SPRITE_HEADER.unpack_from(data, offset)
+            offset += SPRITE_HEADER.size
+            length = cell_size * cell_size * 4
+            if offset + length > len(data):
+                return {}
+            pixels[(display.decode('ascii'), cell_size)] = data[offset:offset + length]
+            offset += length
+        return pixels
+
+    def _write(self) -> None:
+        '''Atomically rewrite the atlas file, ignoring a cache directory that cannot be written.'''
+        try:
+            directory = os.path.dirname(os.path.abspath(self._filename))
+            os.makedirs(directory, exist_ok=True)
+            descriptor, temporary = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        except OSError:
+            return
+        try:
+            with os.fdopen(descriptor, 'wb') as f:
+                f.write(HEADER.pack(ATLAS_MAGIC, ATLAS_VERSION, self._key, len(self._pixels)))
+                for (display, cell_size), pixels in self._pixels.items():
+                    f.write(SPRITE_HEADER.pack(display.encode('ascii'), cell_size))
+                    f.write(pixels)
+            os.replace(temporary, self._filename)
+        except OSError:
+            os.unlink(temporary)
+
+    def get_sprites(self, cell_size: int) -> Dict[str, Image.Image]:
+        '''
+        Return an RGBA image of every entity type scaled to a cell size,
+        scaling and storing them in the atlas if they are not there yet.
+
+        Parameters:
+            cell_size: The width (= height) of a cell in pixels.
+        '''
+        missing = [display for display in IMAGES if (display, cell_size) not in self._pixels]
+        for display in missing:
+            self._pixels[(display, cell_size)] = self._scale(display, cell_size).tobytes()
+        if missing:
+            self._write()
+        return {display: self.get_sprite(display, cell_size) for display in IMAGES}
+
+    def get_sprite(self, display: str, cell_size: int) -> Image.Image:
+        '''
+        Return an RGBA image of one entity type scaled to a cell size. Sizes
+        not in the atlas are scaled from the source image without being
+        stored, so that resizing a window does not grow the atlas file.
+
+        Parameters:
+            display: The display character of the entity type.
+            cell_size: The width (= height) of a cell in pixels.
+        '''
+        pixels = self._pixels.get((display, cell_size))
+        if pixels is None:
+            return self._scale(display, cell_size)
+        return Image.frombuffer('RGBA', (cell_size, cell_size), pixels, 'raw', 'RGBA', 0, 1)
+
+    def _scale(self, display: str, cell_size: int) -> Image.Image:
+        '''
+        Scale the source image of an entity type to a cell size.
+
+        Parameters:
+            display: The display character of the entity type.
+            cell_size: The width (= height) of a cell in pixels.
+        '''
+        source = self._decoded.get(display)
+        if source is None:
+            with Image.open(self._sources[display]) as image:
+                source = self._decoded[display] = image.convert('RGBA')
+        return source.resize((cell_size, cell_size))
+
+
+@lru_cache(maxsize=None)
+def get_sprite_atlas() -> SpriteAtlas:
+    '''Return the sprite atlas shared by every ImageGameField.'''
+    return SpriteAtlas()
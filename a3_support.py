@@ -1,3 +1,4 @@
+from functools import lru_cache
 from typing import Tuple, Optional, Dict, List
 
 PLAYER = "P"
@@ -16,10 +17,36 @@ RIGHT = "D"
 DIRECTIONS = (LEFT, RIGHT)
 COLLECTION_TARGET = 7
 
+# Periods of the scheduled game step and timer, in milliseconds.
+STEP_INTERVAL = 2000
+TIMER_INTERVAL = 1000
+# Most missed ticks a scheduled callback runs at once before skipping ahead.
+MAX_CATCH_UP_TICKS = 3
+GAME_SPEEDS = (0.5, 1, 2, 4)
+# Shortest time between two redraws of the game, in milliseconds.
+FRAME_INTERVAL = 16
+
+# Sections timed by a TickProfiler, and the number of power-of-two
+# microsecond buckets in each of its histograms.
+LOGIC_SECTION = "logic"
+DRAW_SECTION = "draw"
+LATENESS_SECTION = "lateness"
+PROFILE_SECTIONS = (LOGIC_SECTION, DRAW_SECTION, LATENESS_SECTION)
+PROFILE_BUCKETS = 32
+
 COLLECT = "RETURN"
 DESTROY = "SPACE"
 SHOT_TYPES = (DESTROY, COLLECT)
 
+# Discrete actions a policy or environment can take between steps.
+NO_ACTION = 0
+ROTATE_LEFT_ACTION = 1
+ROTATE_RIGHT_ACTION = 2
+FIRE_COLLECT_ACTION = 3
+FIRE_DESTROY_ACTION = 4
+ACTIONS = (NO_ACTION, ROTATE_LEFT_ACTION, ROTATE_RIGHT_ACTION,
+           FIRE_COLLECT_ACTION, FIRE_DESTROY_ACTION)
+
 ENTITY_TYPES = (COLLECTABLE, DESTROYABLE)
 MAP_WIDTH = MAP_HEIGHT = 400
 SCORE_WIDTH = 200
@@ -45,9 +72,23 @@ IMAGES = {COLLECTABLE: "C.png",
           BLOCKER: "B.png",
           PLAYER: "P.png",
           BOMB: "O.png"}
+# Directories searched for the images, relative to the game and then to the
+# working directory, and the file name of the cached atlas of scaled sprites.
+IMAGE_DIRECTORIES = ("images", "")
+SPRITE_ATLAS = "sprites.atlas"
+# Most scaled sprites an ImageGameField keeps while its window is resized.
+PHOTO_IMAGE_CACHE_SIZE = 40
 
 GRID_SIZE = 7
 
+# Largest number of rows (= columns) a GameField draws at once.
+VIEWPORT_SIZE = 21
+
+# Most shared positions a PositionTable keeps, and most tables kept, so that
+# memory follows the cells in use rather than the size of the board.
+POSITION_TABLE_LIMIT = 1 << 16
+POSITION_TABLE_CACHE_SIZE = 8
+
 
 class Position:
     """
@@ -66,6 +107,7 @@ class Position:
         >>> position.get_y()
         4
     """
+    __slots__ = ('_x', '_y')
 
     def __init__(self, x: int, y: int):
         """
@@ -271,3 +313,60 @@ class Position:
         if self._y >= other.get_y():
             return True
         return False
+
+
+class PositionTable:
+    """
+    A table of shared Position instances for the cells of a grid size.
+
+    Grids look positions up here instead of creating a new Position for each
+    move. A position is created the first time its cell is used. Once the
+    table holds POSITION_TABLE_LIMIT positions it starts afresh; positions
+    compare by value, so a new instance for a cell is still equal to the old.
+
+    Examples:
+        >>> table = get_position_table(7)
+        >>> table.get(2, 4)
+        Position(2, 4)
+        >>> table.get(2, 4) is table.get(2, 4)
+        True
+    """
+    __slots__ = ('_size', '_cells')
+
+    def __init__(self, size: int):
+        """
+        A position table is constructed from the size of the grid.
+
+        Parameters:
+            size: The size of the grid.
+        """
+        self._size = size
+        # Shared positions keyed by y * size + x.
+        self._cells: Dict[int, Position] = {}
+
+    def get(self, x: int, y: int) -> Position:
+        """
+        Return the shared position for (x, y).
+
+        Parameters:
+            x: The x coordinate of the position, 0 <= x < size.
+            y: The y coordinate of the position, 0 <= y < size.
+        """
+        key = y * self._size + x
+        position = self._cells.get(key)
+        if position is None:
+            if len(self._cells) >= POSITION_TABLE_LIMIT:
+                self._cells.clear()
+            position = self._cells[key] = Position(x, y)
+        return position
+
+
+@lru_cache(maxsize=POSITION_TABLE_CACHE_SIZE)
+def get_position_table(size: int) -> PositionTable:
+    """
+    Return the shared position table for a grid size.
+
+    Parameters:
+        size: The size of the grid.
+    """
+    return PositionTable(size)
@@ -0,0 +1,291 @@
+'''
+Tournament between Hacker policies on a shared seed schedule.
+
+Every policy plays the same list of seeds, so each seed gives a paired set of
+games with identical spawn rows. Comparing policies seed by seed removes most
+of the luck of the draw, and the paired differences need far fewer games than
+independent runs to separate two policies. Games are spread over a process
+pool, and the report ranks the policies with confidence intervals on win
+rate, collected and destroyed, plus the paired difference from the leader.
+
+Examples:
+    python a3.py tournament --policies greedy random expectimax --games 200
+    python a3_tournament.py --policies greedy expectimax --actions-per-step 3 --json
+'''
+import argparse
+import json
+import math
+import multiprocessing
+import os
+import random
+import statistics
+import sys
+import time
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+from a3_support import *
+from a3_model import GRID_TYPES
+from a3_simulate import (DEFAULT_MAX_TICKS, POLICIES, Outcome, RunningStats,
+                         SessionConfig, play_session)
+
+# Outcome fields compared between policies, with the win indicator first.
+TOURNAMENT_FIELDS = ('won', 'collected', 'destroyed')
+DEFAULT_CONFIDENCE = 0.95
+
+
+def draw_seeds(games: int, seed: int = 0) -> List[int]:
+    '''
+    Return the seed of every game of a tournament, drawn like a3_simulate.
+
+    Parameters:
+        games: The number of seeds.
+        seed: The master seed the game seeds are drawn from.
+    '''
+    master = random.Random(seed)
+    return [master.getrandbits(64) for _ in range(games)]
+
+
+def _play_entry(task: Tuple[int, SessionConfig]) -> Tuple[str, Outcome]:
+    '''Play one (seed, config) game in a worker and tag it with its policy.'''
+    seed, config = task
+    return config.policy, play_session(seed, config)
+
+
+def play_tournament(policies: Sequence[str], seeds: Sequence[int], config: SessionConfig,
+                    workers: Optional[int] = None) -> Iterator[Tuple[str, Outcome]]:
+    '''
+    Yield (policy, outcome) for every policy on every seed as games finish.
+
+    Parameters:
+        policies: The names of the policies in POLICIES to play.
+        seeds: The seeds every policy plays.
+        config: The settings of every game. Its policy is replaced per game.
+        workers: The number of worker processes. Defaults to every core;
+            1 plays the games in this process.
+    '''
+    for policy in policies:
+        if policy not in POLICIES:
+            raise ValueError(f"unknown policy {policy!r}")
+    # Seeds lead the schedule so slow policies are spread over every worker.
+    tasks = [(seed, config._replace(policy = policy)) for seed in seeds for policy in policies]
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        yield from map(_play_entry, tasks)
+        return
+    chunksize = max(1, min(16, len(tasks) // (workers * 8)))
+    with multiprocessing.Pool(workers) as pool:
+        yield from pool.imap_unordered(_play_entry, tasks, chunksize)
+
+
+def mean_interval(stats: RunningStats, z: float) -> Tuple[float, float]:
+    '''
+    Return the (low, high) normal confidence interval of a mean.
+
+    Parameters:
+        stats: The values the mean is taken over.
+        z: The standard normal quantile of the confidence level.
+    '''
+    count = stats.get_count()
+    if count == 0:
+        return 0.0, 0.0
+    half = z * stats.get_stdev() / math.sqrt(count)
+    return stats.get_mean() - half, stats.get_mean() + half
+
+
+def wilson_interval(successes: int, trials: int, z: float) -> Tuple[float, float]:
+    '''
+    Return the (low, high) Wilson score interval of a proportion, which stays
+    inside [0, 1] even when every game is won or lost.
+
+    Parameters:
+        successes: The number of successful trials.
+        trials: The number of trials.
+        z: The standard normal quantile of the confidence level.
+    '''
+    if trials == 0:
+        return 0.0, 1.0
+    rate = successes / trials
+    denominator = 1 + z * z / trials
+    centre = (rate + z * z / (2 * trials)) / denominator
+    half = z * math.sqrt(rate * (1 - rate) / trials + z * z / (4 * trials * trials)) / denominator
+    return max(0.0, centre - half), min(1.0, centre + half)
+
+
+class TournamentResults:
+    '''TournamentResults collects the paired outcomes of a tournament as they arrive.'''
+    def __init__(self, policies: Sequence[str], seeds: Sequence[int],
+                 confidence: float = DEFAULT_CONFIDENCE) -> None:
+        '''
+        Results are constructed with the policies, seeds and confidence level.
+
+        Parameters:
+            policies: The names of the policies playing.
+            seeds: The seeds every policy plays.
+            confidence: The confidence level of the intervals, e.g. 0.95.
+        '''
+        self._policies = list(policies)
+        self._seeds = list(seeds)
+        self._z = statistics.NormalDist().inv_cdf(0.5 + confidence / 2)
+        self._confidence = confidence
+        self._outcomes: Dict[str, Dict[int, Outcome]] = {policy: {} for policy in policies}
+
+    def add(self, policy: str, outcome: Outcome) -> None:
+        '''
+        Add the outcome of one game.
+
+        Parameters:
+            policy: The policy that played the game.
+            outcome: The outcome of the game.
+        '''
+        self._outcomes[policy][outcome.seed] = outcome
+
+    def get_outcomes(self, policy: str) -> Dict[int, Outcome]:
+        '''
+        Return the outcomes of a policy keyed by seed.
+
+        Parameters:
+            policy: The name of the policy.
+        '''
+        return self._outcomes[policy]
+
+    def _stats(self, policy: str) -> Dict[str, RunningStats]:
+        '''Return running stats of each compared field of a policy.'''
+        stats = {field: RunningStats() for field in TOURNAMENT_FIELDS}
+        outcomes = self._outcomes[policy]
+        # Seed order, not arrival order, keeps the report independent of workers.
+        for seed in self._seeds:
+            if seed in outcomes:
+                for field in TOURNAMENT_FIELDS:
+                    stats[field].add(getattr(outcomes[seed], field))
+        return stats
+
+    def _paired(self, policy: str, other: str) -> Dict[str, RunningStats]:
+        '''Return running stats of the per-seed difference policy - other.'''
+        stats = {field: RunningStats() for field in TOURNAMENT_FIELDS}
+        mine = self._outcomes[policy]
+        theirs = self._outcomes[other]
+        for seed in self._seeds:
+            if seed in mine and seed in theirs:
+                for field in TOURNAMENT_FIELDS:
+                    stats[field].add(getattr(mine[seed], field) - getattr(theirs[seed], field))
+        return stats
+
+    def get_ranking(self) -> List[str]:
+        '''Return the policies ordered by win rate, then mean collected, then mean destroyed.'''
+        means = {policy: tuple(stats.get_mean() for stats in self._stats(policy).values())
+                 for policy in self._policies}
+        return sorted(self._policies, key = lambda policy: means[policy], reverse = True)
+
+    def to_dict(self) -> dict:
+        '''
+        Return the ranked report as a dictionary. Each policy has the mean
+        and interval of every compared field, and every policy after the
+        leader has the paired difference from it.
+        '''
+        ranking = self.get_ranking()
+        leader = ranking[0] if ranking else None
+        report = {'confidence': self._confidence, 'seeds': len(self._seeds),
+                  'leader': leader, 'policies': []}
+        for rank, policy in enumerate(ranking, 1):
+            stats = self._stats(policy)
+            entry = {'rank': rank, 'policy': policy, 'games': stats['won'].get_count()}
+            wins = sum(outcome.won for outcome in self._outcomes[policy].values())
+            entry['won'] = {'mean': stats['won'].get_mean(),
+                            'interval': wilson_interval(wins, stats['won'].get_count(), self._z)}
+            for field in TOURNAMENT_FIELDS[1:]:
+                entry[field] = {'mean': stats[field].get_mean(),
+                                'interval': mean_interval(stats[field], self._z)}
+            if policy != leader:
+                leader_stats = self._stats(leader)
+                paired = self._paired(policy, leader)
+                entry['versus_leader'] = {}
+                for field in TOURNAMENT_FIELDS:
+                    difference = paired[field]
+                    # Variance of the difference had the two policies played
+                    # independent seeds, relative to the paired variance.
+                    unpaired = stats[field].get_stdev() ** 2 + leader_stats[field].get_stdev() ** 2
+                    paired_variance = difference.get_stdev() ** 2
+                    entry['versus_leader'][field] = {
+                        'mean': difference.get_mean(),
+                        'interval': mean_interval(difference, self._z),
+                        'variance_reduction': unpaired / paired_variance if paired_variance else None}
+            report['policies'].append(entry)
+        return report
+
+    def format(self) -> str:
+        '''Return the ranked report as a table.'''
+        report = self.to_dict()
+        lines = [f"{report['seeds']} shared seeds, {report['confidence']:.0%} intervals, "
+                 f"differences are paired against {report['leader']}",
+                 f"{'#':>2} {'policy':12} {'won':>24} {'collected':>19} {'destroyed':>19} "
+                 f"{'d won':>17} {'d collected':>19}"]
+
+        def cell(value: dict, percent: bool = False) -> str:
+            low, high = value['interval']
+            half = (high - low) / 2
+            if percent:
+                return f"{value['mean']:7.1%} ±{half:7.1%}"
+            return f"{value['mean']:8.2f} ±{half:8.2f}"
+
+        def rate_cell(value: dict) -> str:
+            # The Wilson interval is not centred on the mean, so print its ends.
+            low, high = value['interval']
+            return f"{value['mean']:6.1%} [{low:6.1%}, {high:6.1%}]"
+
+        for entry in report['policies']:
+            line = (f"{entry['rank']:>2} {entry['policy']:12} {rate_cell(entry['won']):>24} "
+                    f"{cell(entry['collected']):>19} {cell(entry['destroyed']):>19}")
+            versus = entry.get('versus_leader')
+            if versus:
+                line += f" {cell(versus['won'], True):>17} {cell(versus['collected']):>19}"
+            lines.append(line)
+        return '\n'.join(lines)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    '''Run a tournament from the command line and print its ranked report.'''
+    parser = argparse.ArgumentParser(prog = "a3.py tournament",
+                                     description = "Play Hacker policies against each other on shared seeds.")
+    parser.add_argument('--policies', nargs = '+', choices = sorted(POLICIES),
+                        default = ['greedy', 'random', 'idle'])
+    parser.add_argument('--games', type = int, default = 200, help = "seeds played by every policy")
+    parser.add_argument('--seed', type = int, default = 0, help = "master seed of the schedule")
+    parser.add_argument('--workers', type = int, default = None,
+                        help = "worker processes (default: every core)")
+    parser.add_argument('--size', type = int, default = GRID_SIZE)
+    parser.add_argument('--grid', choices = sorted(GRID_TYPES), default = 'ScrollingGrid')
+    parser.add_argument('--max-ticks', type = int, default = DEFAULT_MAX_TICKS,
+                        help = "steps after which a game counts as timed out")
+    parser.add_argument('--target', type = int, default = COLLECTION_TARGET,
+                        help = "Collectables needed to win")
+    parser.add_argument('--actions-per-step', type = int, default = 1,
+                        help = "policy actions between two steps")
+    parser.add_argument('--confidence', type = float, default = DEFAULT_CONFIDENCE,
+                        help = "confidence level of the intervals")
+    parser.add_argument('--json', action = 'store_true', help = "print the report as JSON")
+    args = parser.parse_args(argv)
+
+    policies = list(dict.fromkeys(args.policies))
+    seeds = draw_seeds(args.games, args.seed)
+    config = SessionConfig(policies[0], args.size, args.grid, args.max_ticks,
+                           args.target, args.actions_per_step)
+    results = TournamentResults(policies, seeds, args.confidence)
+    start = time.perf_counter()
+    for policy, outcome in play_tournament(policies, seeds, config, args.workers):
+        results.add(policy, outcome)
+    elapsed = time.perf_counter() - start
+
+    if args.json:
+        report = results.to_dict()
+        report['config'] = config._replace(policy = None)._asdict()
+        report['seed'] = args.seed
+        report['seconds'] = elapsed
+        print(json.dumps(report, indent = 2))
+    else:
+        print(results.format())
+        print(f"{len(seeds) * len(policies) / elapsed:.0f} games/s over {elapsed:.2f}s")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
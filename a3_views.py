@@ -0,0 +1,597 @@
+'''
+The tk views of the Hacker game: the game fields, the score bar and the
+status bar.
+'''
+from typing import Iterable, Iterator
+import tkinter as tk
+from tkinter import Frame
+from tkinter.constants import BOTTOM, TOP
+from PIL import ImageTk
+
+from a3_support import *
+from a3_model import Entity, Grid
+from a3_scheduler import TickProfiler, TickScheduler
+
+class AbstractField(tk.Canvas):
+    '''AbstractFieldis an abstract view class which inherits fromtk.Canvasand provides base func-tionality for other view classes.'''
+    def __init__(self, master: tk.Tk, rows, cols, width, height) -> None:
+        '''
+        The AbstractField class is constructed from the rows, cols, width and height.
+        
+        Parameters:
+            rows: The number of rows in the grid.
+            cols: The number of cols in the grid.
+            width: The width of the grid.
+            height: The height of the grid.        
+        '''
+        super().__init__(master, width = width, height = height)
+        self._master = master
+        self._rows = rows
+        self._cols = cols
+        self._width = width
+        self._height = height
+        self._pending_size = (width, height)
+        self._resize_id = None
+        self.bind('<Configure>', self._on_configure)
+        # Per-cell geometry, indexed by y * cols + x, and the
+        # (width, height, rows, cols) it was computed for.
+        self._geometry_key = None
+        self._bboxes: List[Tuple[float, float, float, float]] = []
+        self._centers: List[Tuple[float, float]] = []
+
+    def _on_configure(self, event) -> None:
+        '''
+        Schedules a resize when the canvas changes size. The bursts of
+        configure events sent while a window edge is dragged are coalesced
+        into at most one resize every FRAME_INTERVAL milliseconds.
+
+        Parameters:
+            event: Configure event.
+        '''
+        inset = 2 * (int(self['highlightthickness']) + int(self['borderwidth']))
+        self._pending_size = (event.width - inset, event.height - inset)
+        if self._resize_id is None:
+            self._resize_id = self.after(FRAME_INTERVAL, self._apply_resize)
+
+    def _apply_resize(self) -> None:
+        '''Resizes the field to the last size reported by a configure event.'''
+        self._resize_id = None
+        width, height = self._pending_size
+        if width > 0 and height > 0 and (width, height) != (self._width, self._height):
+            self.resize(width, height)
+
+    def resize(self, width, height) -> None:
+        '''
+        Sets the size of the field in pixels and moves the canvas items to
+        the new cell geometry.
+
+        Parameters:
+            width: The width of the field.
+            height: The height of the field.
+        '''
+        self._width = width
+        self._height = height
+        self._layout()
+
+    def _layout(self) -> None:
+        '''Moves the canvas items to match the size of the field. Subclasses override this.'''
+        pass
+
+    def _update_geometry(self) -> None:
+        '''Rebuilds the bounding box and centre tables if the size, rows or cols changed.'''
+        key = (self._width, self._height, self._rows, self._cols)
+        if key == self._geometry_key:
+            return
+        single_width = self._width / self._cols
+        single_height = self._height / self._rows
+        bboxes = []
+        for y in range(self._rows):
+            y_min = y * single_height
+            y_max = (y + 1) * single_height
+            for x in range(self._cols):
+                bboxes.append((x * single_width, y_min, (x + 1) * single_width, y_max))
+        self._bboxes = bboxes
+        self._centers = [((x_min + x_max) / 2, (y_min + y_max) / 2)
+                         for x_min, y_min, x_max, y_max in bboxes]
+        self._geometry_key = key
+
+    def _cell_index(self, position: Position) -> Optional[int]:
+        '''
+        Returns the index of a position in the geometry tables, or None if it
+        is outside the field.
+
+        Parameters:
+            position: The specific position of the grid.
+        '''
+        x = position.get_x()
+        y = position.get_y()
+        if 0 <= x < self._cols and 0 <= y < self._rows:
+            return y * self._cols + x
+        return None
+
+    def get_bbox(self, position: Position) -> Tuple[int, int, int, int]:
+        '''
+        Returns the bounding box for the position.
+        
+        Parameters:
+            position: The specific position of the grid.
+        '''
+        self._update_geometry()
+        index = self._cell_index(position)
+        if index is not None:
+            return self._bboxes[index]
+        single_width = self._width / self._cols
+        single_height = self._height / self._rows
+        x_min = position.get_x() * single_width
+        y_min = position.get_y() * single_height
+        x_max = (position.get_x() + 1) * single_width
+        y_max = (position.get_y() + 1) * single_height
+        return (x_min, y_min, x_max, y_max)
+
+    def get_bboxes(self, positions: Iterable[Position]) -> List[Tuple[float, float, float, float]]:
+        '''
+        Returns the bounding boxes for many positions at once.
+
+        Parameters:
+            positions: Positions inside the field.
+        '''
+        self._update_geometry()
+        bboxes = self._bboxes
+        cols = self._cols
+        return [bboxes[position.get_y() * cols + position.get_x()] for position in positions]
+
+    def get_centers(self, positions: Iterable[Position]) -> List[Tuple[float, float]]:
+        '''
+        Returns the graphics coordinates of the centres of many cells at once.
+
+        Parameters:
+            positions: Positions inside the field.
+        '''
+        self._update_geometry()
+        centers = self._centers
+        cols = self._cols
+        return [centers[position.get_y() * cols + position.get_x()] for position in positions]
+
+    def pixeltoposition(self, pixel) -> Tuple[int, int]:
+        '''
+        Converts the (x, y) pixel position (in graphics units) to a (row, column) position.
+        
+        Parameters:
+            pixel: The pixel position of the grid.
+        '''
+        x = pixel[0] // (self._width / self._cols)
+        y = pixel[1] // (self._height / self._rows)
+        return (x, y)
+
+    def get_position_center(self, position) -> Tuple[int, int]:
+        '''
+        Gets the graphics coordinates for the center of the cell at the given (row, column) position.
+
+        Parameters:
+            position: The specific position of the grid.
+        '''
+        self._update_geometry()
+        index = self._cell_index(position)
+        if index is not None:
+            return self._centers[index]
+        x_min, y_min, x_max, y_max = self.get_bbox(position)
+        return ((x_min + x_max) / 2, (y_min + y_max) / 2)
+
+    def annotate_position(self, position, text) -> None:
+        '''
+        Annotates the center of the cell at the given (row, column) position with the provided text.
+        
+        Parameters:
+            position: The specific position of the grid.
+            text: The specific text of the grid.
+        '''
+        x_center, y_center = self.get_position_center(position)
+        self.create_text(x_center, y_center, text = text)
+
+
+class GameField(AbstractField):
+    '''GameFieldis a visual representation of the game grid which inherits from AbstractField. '''
+    def __init__(self, master, size, width = MAP_WIDTH, height = MAP_HEIGHT, viewport = None):
+        '''
+        The GameField class is constructed from the size, width and height.
+        Only a viewport of the grid is drawn: the rows nearest the player and
+        the columns centred on the player.
+        
+        Parameters:
+            size: The number of rows in the gamefield.
+            width: The width of the gamefield.
+            height: The height of the gamefield.
+            viewport: The number of rows (= number of columns) shown.
+                Defaults to the whole grid, up to VIEWPORT_SIZE.
+        '''
+        if viewport is None:
+            viewport = min(size, VIEWPORT_SIZE)
+        super().__init__(master, rows = viewport, cols = viewport, width = width, height = height)
+        self._size = size
+        self._origin_x = size // 2 - viewport // 2
+        # Retained canvas items and the display shown by each cell.
+        self._background_items: List[int] = []
+        self._cell_items: Dict[Tuple[int, int], Tuple[int, ...]] = {}
+        self._cell_displays: Dict[Tuple[int, int], str] = {}
+
+    def draw_grid(self, grid: Grid) -> None:
+        '''
+        Draws the entities in the game grid at their given position.
+        
+        Parameters:
+            grid: The game grid.
+        '''
+        visible = list(self.get_visible_entities(grid))
+        bboxes = self.get_bboxes(position for position, _ in visible)
+        for (position, entity), (x_min, y_min, x_max, y_max) in zip(visible, bboxes):
+
+            # Create a grid at the location corresponding to the entity.
+            if entity.display() == COLLECTABLE:         
+                self.create_rectangle(x_min, y_min, x_max, y_max, fill = COLOURS[COLLECTABLE])
+            elif entity.display() == DESTROYABLE:         
+                self.create_rectangle(x_min, y_min, x_max, y_max, fill = COLOURS[DESTROYABLE])
+            elif entity.display() == BLOCKER:         
+                self.create_rectangle(x_min, y_min, x_max, y_max, fill = COLOURS[BLOCKER])
+            elif entity.display() == PLAYER:          
+                self.create_rectangle(x_min, y_min, x_max, y_max, fill = COLOURS[PLAYER])
+            elif entity.display() == BOMB:         
+                self.create_rectangle(x_min, y_min, x_max, y_max, fill = COLOURS[BOMB])
+            self.annotate_position(position, entity.display())
+
+    def get_visible_entities(self, grid: Grid) -> Iterator[Tuple[Position, Entity]]:
+        '''
+        Yields the entities inside the viewport, with their positions
+        translated to viewport cells. Only the viewport's rows and columns
+        of the grid are read.
+
+        Parameters:
+            grid: The game grid.
+        '''
+        origin_x = self._origin_x
+        positions = get_position_table(self._cols)
+        for position, entity in grid.get_window(origin_x, self._cols, self._rows):
+            yield positions.get(position.get_x() - origin_x, position.get_y()), entity
+
+    def draw_player_area(self) -> None:
+        '''Draws the grey area a player is placed on.'''
+        self.create_rectangle(0, 0, self._width, self._height / self._rows, fill = PLAYER_AREA)
+
+    def draw_background(self) -> None:
+        '''Draws the field and the player area once, behind every cell item.'''
+        if self._background_items:
+            return
+        self._background_items.append(self.create_rectangle(0, 0, self._width, self._height, fill = FIELD_COLOUR))
+        self._background_items.append(self.create_rectangle(0, 0, self._width, self._height / self._rows, fill = PLAYER_AREA))
+        self.tag_lower(self._background_items[1])
+        self.tag_lower(self._background_items[0])
+
+    def update_grid(self, grid: Grid) -> None:
+        '''
+        Updates the retained cell items so they show the entities of the
+        grid. Only cells whose entity changed since the last update are
+        reconfigured.
+
+        Parameters:
+            grid: The game grid.
+        '''
+        displays = {(position.get_x(), position.get_y()): entity.display()
+                    for position, entity in self.get_visible_entities(grid)}
+        previous = self._cell_displays
+        for cell in previous:
+            if cell not in displays:
+                for item in self._cell_items[cell]:
+                    self.itemconfigure(item, state = tk.HIDDEN)
+        for cell, display in displays.items():
+            if previous.get(cell) != display:
+                if cell not in self._cell_items:
+                    self._cell_items[cell] = self._create_cell(Position(cell[0], cell[1]))
+                self._show_cell(self._cell_items[cell], display)
+        self._cell_displays = displays
+
+    def _layout(self) -> None:
+        '''Moves the background and every retained cell item to the current cell geometry.'''
+        if self._background_items:
+            field, player_area = self._background_items
+            self.coords(field, 0, 0, self._width, self._height)
+            self.coords(player_area, 0, 0, self._width, self._height / self._rows)
+        positions = get_position_table(self._cols)
+        cells = [positions.get(x, y) for x, y in self._cell_items]
+        for position, bbox, center, items in zip(cells, self.get_bboxes(cells), self.get_centers(cells),
+                                                 self._cell_items.values()):
+            self._place_cell(items, bbox, center)
+
+    def _place_cell(self, items: Tuple[int, ...], bbox: Tuple[float, ...], center: Tuple[float, float]) -> None:
+        '''
+        Moves the canvas items of a cell to its geometry.
+
+        Parameters:
+            items: The canvas items of the cell.
+            bbox: The bounding box of the cell.
+            center: The centre of the cell.
+        '''
+        rectangle, text = items
+        self.coords(rectangle, *bbox)
+        self.coords(text, *center)
+
+    def _create_cell(self, position: Position) -> Tuple[int, ...]:
+        '''
+        Creates the hidden canvas items used to show an entity at a position.
+
+        Parameters:
+            position: The specific position of the grid.
+        '''
+        x_min, y_min, x_max, y_max = self.get_bbox(position)
+        x_center, y_center = self.get_position_center(position)
+        rectangle = self.create_rectangle(x_min, y_min, x_max, y_max, state = tk.HIDDEN)
+        text = self.create_text(x_center, y_center, state = tk.HIDDEN)
+        return (rectangle, text)
+
+    def _show_cell(self, items: Tuple[int, ...], display: str) -> None:
+        '''
+        Configures the canvas items of a cell to show an entity.
+
+        Parameters:
+            items: The canvas items of the cell.
+            display: The display character of the entity.
+        '''
+        rectangle, text = items
+        self.itemconfigure(rectangle, fill = COLOURS[display], state = tk.NORMAL)
+        self.itemconfigure(text, text = display, state = tk.NORMAL)
+
+
+class ScoreBar(AbstractField):
+    '''ScoreBaris a visual representation of shot statistics from the player which inherits fromAbstractField.'''
+    def __init__(self, master, rows) -> None:
+        '''
+        The ScoreBar class is constructed from the row.
+        
+        Parameters:
+            roww: The number of rows contained in the ScoreBar canvas.        
+        '''
+        super().__init__(master, rows = rows, cols = 2, width = SCORE_WIDTH, height = MAP_HEIGHT)
+        self._background_item = None
+        self._collected_item = None
+        self._destroyed_item = None
+        self._scores = None
+
+    def _layout(self) -> None:
+        '''Stretches the background to the size of the score bar.'''
+        if self._background_item is not None:
+            self.coords(self._background_item, 0, 0, self._width, self._height)
+
+    def draw_scores(self, collected: int, destroyed: int) -> None:
+        '''
+        Draws the score labels on first use, then only updates the numbers
+        when they change.
+
+        Parameters:
+            collected: The number of Collectables acquired.
+            destroyed: The number of Destroyables removed with a shot.
+        '''
+        if self._collected_item is None:
+            scorebar_height = BAR_HEIGHT
+            scorebar_width = SCORE_WIDTH
+            self._background_item = self.create_rectangle(0, 0, self._width, self._height, fill = SCORE_COLOUR)
+            self.create_text(int(scorebar_width / 2), int(scorebar_height / 4), text = "Score", font = ('Arial', 24))
+            self.create_text(int(scorebar_width / 4 * 1.5), int(scorebar_height / 4 * 2), text = "Collected:", font = ('Arial', 24))
+            self.create_text(int(scorebar_width / 4 * 1.5), int(scorebar_height / 4 * 3), text = "Destroyed:", font = ('Arial', 24))
+            self._collected_item = self.create_text(int(scorebar_width / 4 * 3.5), int(scorebar_height / 4 * 2), font = ('Arial', 24))
+            self._destroyed_item = self.create_text(int(scorebar_width / 4 * 3.5), int(scorebar_height / 4 * 3), font = ('Arial', 24))
+        if self._scores != (collected, destroyed):
+            self.itemconfigure(self._collected_item, text = f"{collected}")
+            self.itemconfigure(self._destroyed_item, text = f"{destroyed}")
+            self._scores = (collected, destroyed)
+
+
+class ImageGameField(GameField):
+    '''Create a new view class, ImageGameField, that extends your existing GameField class.'''
+    def __init__(self, master, size, width, height, viewport = None) -> None:
+        '''
+        The ImageGameField class is constructed from the size, width and height.
+        
+        Parameters:
+            size: Represents the number of rows (= number of columns) in the game map. 
+            width: The width of the imagegamefield.
+            height: The width of the imagegamefield.
+            viewport: The number of rows (= number of columns) shown.
+        '''
+        super().__init__(master, size, width, height, viewport)
+        from a3_sprites import get_sprite_atlas
+        # (display, cell size) -> PhotoImage, least recently used first.
+        self._photo_images: Dict[Tuple[str, int], ImageTk.PhotoImage] = {}
+        self._cell_size = self.get_cell_size()
+        for display, sprite in get_sprite_atlas().get_sprites(self._cell_size).items():
+            self._photo_images[(display, self._cell_size)] = ImageTk.PhotoImage(sprite)
+        self._load_images()
+
+    def get_cell_size(self) -> int:
+        '''Returns the width (= height) in pixels of the square sprites that fit a cell.'''
+        return max(1, int(min(self._width / self._cols, self._height / self._rows)))
+
+    def _get_photo_image(self, display: str, cell_size: int) -> ImageTk.PhotoImage:
+        '''
+        Returns the sprite of an entity type at a cell size, keeping the
+        PHOTO_IMAGE_CACHE_SIZE most recently used sprites. Only a cache miss
+        resamples the image.
+
+        Parameters:
+            display: The display character of the entity.
+            cell_size: The width (= height) of a cell in pixels.
+        '''
+        key = (display, cell_size)
+        image = self._photo_images.pop(key, None)
+        if image is None:
+            from a3_sprites import get_sprite_atlas
+            image = ImageTk.PhotoImage(get_sprite_atlas().get_sprite(display, cell_size))
+            if len(self._photo_images) >= PHOTO_IMAGE_CACHE_SIZE:
+                del self._photo_images[next(iter(self._photo_images))]
+        self._photo_images[key] = image
+        return image
+
+    def _load_images(self) -> None:
+        '''Selects the sprites for the current cell size.'''
+        self._images = {display: self._get_photo_image(display, self._cell_size) for display in IMAGES}
+        self._blocker = self._images[BLOCKER]
+        self._collectable = self._images[COLLECTABLE]
+        self._destroyable = self._images[DESTROYABLE]
+        self._player = self._images[PLAYER]
+        self._bomb = self._images[BOMB]
+
+    def _layout(self) -> None:
+        '''Moves every cell to the new geometry and swaps in sprites of the new cell size.'''
+        super()._layout()
+        cell_size = self.get_cell_size()
+        if cell_size != self._cell_size:
+            self._cell_size = cell_size
+            self._load_images()
+            for cell, display in self._cell_displays.items():
+                self._show_cell(self._cell_items[cell], display)
+
+    def _place_cell(self, items: Tuple[int, ...], bbox: Tuple[float, ...], center: Tuple[float, float]) -> None:
+        '''
+        Moves the image item of a cell to its centre.
+
+        Parameters:
+            items: The canvas items of the cell.
+            bbox: The bounding box of the cell.
+            center: The centre of the cell.
+        '''
+        self.coords(items[0], *center)
+
+    def draw_grid(self, grid: Grid) -> None:
+        '''
+        Draws the entities' image in the game grid at their given position.
+        
+        Parameters:
+            grid: The game grid.
+        '''
+        visible = list(self.get_visible_entities(grid))
+        centers = self.get_centers(position for position, _ in visible)
+        for (position, entity), position_center in zip(visible, centers):
+            entity_display = entity.display()
+
+            # Stick images of different entities in its position.
+            if entity_display == BLOCKER:
+                self.create_image(position_center[0], position_center[1], image = self._blocker)
+            elif entity_display == COLLECTABLE:
+                self.create_image(position_center[0], position_center[1], image = self._collectable)
+            elif entity_display == DESTROYABLE:
+                self.create_image(position_center[0], position_center[1], image = self._destroyable)
+            elif entity_display == PLAYER:
+                self.create_image(position_center[0], position_center[1], image = self._player)
+            elif entity_display == BOMB:
+                self.create_image(position_center[0], position_center[1], image = self._bomb)
+
+    def _create_cell(self, position: Position) -> Tuple[int, ...]:
+        '''
+        Creates the hidden image item used to show an entity at a position.
+
+        Parameters:
+            position: The specific position of the grid.
+        '''
+        x_center, y_center = self.get_position_center(position)
+        return (self.create_image(x_center, y_center, state = tk.HIDDEN),)
+
+    def _show_cell(self, items: Tuple[int, ...], display: str) -> None:
+        '''
+        Configures the image item of a cell to show an entity.
+
+        Parameters:
+            items: The canvas items of the cell.
+            display: The display character of the entity.
+        '''
+        self.itemconfigure(items[0], image = self._images[display], state = tk.NORMAL)
+
+
+class StatusBar(tk.Frame):
+    '''Add a StatusBar class that inherits from tk.Frame.'''
+    def __init__(self, master: tk.Tk, scheduler: TickScheduler) -> None:
+        '''
+        The StatusBar class is constructed from the master and the scheduler
+        that drives its timer.
+
+        Parameters:
+            scheduler: The scheduler of the controller.
+        '''
+        self._time_counter = 0 
+        self._shots_counter = 0
+        self._master = master
+        self._scheduler = scheduler
+        super().__init__(master)
+        self._frame_list: List[Frame] = []
+        for _ in range(3):
+            self._frame_list.append(Frame(self))
+
+        # Create shots label.
+        self._total_shots = tk.Label(self._frame_list[0], text = "Total Shots")
+        self._total_shots_num = tk.Label(self._frame_list[0], text = str(self._shots_counter))
+        self._total_shots.pack(side = TOP)
+        self._total_shots_num.pack(side = TOP)
+
+        # Create timer label.
+        self._timer = tk.Label(self._frame_list[1], text = "Timer")
+        self._timer_num = tk.Label(self._frame_list[1], text = f"{self._time_counter // 60}m {self._time_counter % 60}s")
+        self._timer.pack(side = TOP)
+        self._timer_num.pack(side = TOP)
+
+        # Create pause button.
+        self._pause = False
+        self._button = tk.Button(self._frame_list[2], text = "Pause", command = self.pause)    
+        self._button.pack()
+
+        self.pack(side = BOTTOM)
+        for frame in self._frame_list:
+            frame.pack(side = 'left')
+
+        # Create the profile label, shown only while profiling.
+        self._profiler: Optional[TickProfiler] = None
+        self._profile_label = tk.Label(self, font = ('Courier', 9))
+        self._scheduler.subscribe(TIMER_INTERVAL, self.step)
+
+    def step(self) -> None:
+        '''The step method is called by the scheduler every TIMER_INTERVAL milliseconds.'''
+        self._time_counter += 1
+        self._timer_num.configure(text = f"{self._time_counter // 60}m {self._time_counter % 60}s")
+        if self._profiler is not None:
+            self._profile_label.configure(text = self._profiler.summary())
+
+    def set_profiler(self, profiler: Optional[TickProfiler]) -> None:
+        '''
+        Show a summary of a profiler below the status bar, refreshed every
+        TIMER_INTERVAL milliseconds, or hide it when profiler is None.
+
+        Parameters:
+            profiler: The profiler, or None.
+        '''
+        self._profiler = profiler
+        if profiler is None:
+            self._profile_label.pack_forget()
+        else:
+            self._profile_label.configure(text = profiler.summary())
+            self._profile_label.pack(side = BOTTOM)
+
+    def refresh_shots_num_label(self) -> None:
+        '''Refresh the number of shots.'''
+        self._shots_counter += 1
+        self._total_shots_num.configure(text = str(self._shots_counter))
+
+    def pause(self) -> None:
+        '''Pause or resume the game.'''
+        if self._pause:
+            self._pause = False
+            self._scheduler.resume()
+        else:
+            self._pause = True
+            self._scheduler.pause()
+
+    def get_total_shots(self) -> int:
+        '''Return the number of total shots.'''
+        return self._shots_counter
+
+    def get_time(self) -> int:
+        '''Return the number of time counter.'''
+        return self._time_counter
+
+    def get_pause(self) -> bool:
+        '''Return the status of pause.'''
+        return self._pause
@@ -0,0 +1,215 @@
+'''
+Cross-backend equivalence tests.
+
+Every grid backend, the batch simulator and the bitboard claim to follow the
+rules of Game on the default dict Grid exactly. These tests play seeded
+random action traces on each of them side by side and compare the board and
+counters after every action.
+'''
+import random
+import unittest
+
+from a3_support import *
+from a3_model import (ArrayGrid, CELL_DISPLAYS, Game, Grid, ScrollingGrid,
+                      generate_spawn_row)
+from a3_bitboard import BitBoard
+
+try:
+    import numpy as np
+    from a3_batch import BatchGame, encode_directions, encode_shots
+except ImportError:
+    np = None
+
+SIZES = (3, 5, 7, 12)
+SEEDS = range(8)
+TRACE_LENGTH = 300
+
+
+def random_action(rng: random.Random) -> str:
+    '''
+    Return one of 'L', 'R', 'C', 'D' or 'S' for rotate left, rotate right,
+    fire collect, fire destroy and step.
+
+    Parameters:
+        rng: The random stream of the trace.
+    '''
+    return rng.choice('LRCDS')
+
+
+def game_state(game: Game) -> tuple:
+    '''
+    Return everything observable about a game.
+
+    Parameters:
+        game: The game to inspect.
+    '''
+    grid = game.get_grid()
+    size = grid.get_size()
+    return (grid.serialise(), game.get_num_collected(), game.get_num_destroyed(),
+            game.get_total_shots(), game.has_won(), game.has_lost(),
+            [grid.get_nearest_in_column(x) for x in range(size)],
+            [grid.get_destroyables_in_row(y) for y in range(size)])
+
+
+def play(game: Game, action: str) -> None:
+    '''
+    Apply one trace action to a game.
+
+    Parameters:
+        game: The game to change.
+        action: The trace action, see random_action.
+    '''
+    if action == 'L':
+        game.rotate_grid(LEFT)
+    elif action == 'R':
+        game.rotate_grid(RIGHT)
+    elif action == 'C':
+        game.fire(COLLECT)
+    elif action == 'D':
+        game.fire(DESTROY)
+    else:
+        game.step()
+
+
+class GridBackendTest(unittest.TestCase):
+    '''ArrayGrid and ScrollingGrid match Grid on every action.'''
+    def test_backends_match_grid(self) -> None:
+        for size in SIZES:
+            for seed in SEEDS:
+                with self.subTest(size = size, seed = seed):
+                    games = [Game(size, grid_type, seed)
+                             for grid_type in (Grid, ArrayGrid, ScrollingGrid)]
+                    rng = random.Random(seed)
+                    for _ in range(TRACE_LENGTH):
+                        action = random_action(rng)
+                        for game in games:
+                            play(game, action)
+                        expected = game_state(games[0])
+                        for game in games[1:]:
+                            self.assertEqual(game_state(game), expected)
+
+    def test_remove_player(self) -> None:
+        for seed in SEEDS:
+            with self.subTest(seed = seed):
+                games = [Game(7, grid_type, seed)
+                         for grid_type in (Grid, ArrayGrid, ScrollingGrid)]
+                rng = random.Random(seed)
+                for game in games:
+                    game.get_grid().remove_entity(game.get_player_position())
+                for _ in range(TRACE_LENGTH):
+                    action = random_action(rng)
+                    for game in games:
+                        play(game, action)
+                    expected = game_state(games[0])
+                    self.assertNotIn((3, 0), expected[0])
+                    for game in games[1:]:
+                        self.assertEqual(game_state(game), expected)
+
+    def test_cells_match_serialise(self) -> None:
+        for grid_type in (ArrayGrid, ScrollingGrid):
+            for seed in SEEDS:
+                with self.subTest(grid_type = grid_type.__name__, seed = seed):
+                    game = Game(7, grid_type, seed)
+                    rng = random.Random(seed)
+                    for _ in range(TRACE_LENGTH):
+                        play(game, random_action(rng))
+                        cells = game.get_grid().get_cells()
+                        serialised = {(index % 7, index // 7): CELL_DISPLAYS[code]
+                                      for index, code in enumerate(cells) if code}
+                        self.assertEqual(serialised, game.get_grid().serialise())
+
+
+    def test_window_matches_serialise(self) -> None:
+        size = 12
+        windows = [(0, size, size), (3, 5, 4), (7, 5, 12), (0, 1, 1), (11, 1, 6)]
+        for grid_type in (Grid, ArrayGrid, ScrollingGrid):
+            for seed in SEEDS:
+                with self.subTest(grid_type = grid_type.__name__, seed = seed):
+                    game = Game(size, grid_type, seed)
+                    rng = random.Random(seed)
+                    for _ in range(TRACE_LENGTH):
+                        play(game, random_action(rng))
+                        grid = game.get_grid()
+                        serialised = grid.serialise()
+                        for x_start, columns, rows in windows:
+                            window = {(position.get_x(), position.get_y()): entity.display()
+                                      for position, entity in grid.get_window(x_start, columns, rows)}
+                            expected = {(x, y): display for (x, y), display in serialised.items()
+                                        if x_start <= x < x_start + columns and y < rows}
+                            self.assertEqual(window, expected)
+
+
+class BitBoardTest(unittest.TestCase):
+    '''BitBoard matches Game when it is given the same spawn rows.'''
+    def test_bitboard_matches_game(self) -> None:
+        for size in SIZES:
+            for seed in SEEDS:
+                with self.subTest(size = size, seed = seed):
+                    game = Game(size, Grid, seed)
+                    board = BitBoard.from_serialised(game.get_grid().serialise(), size)
+                    # Game draws its spawn rows from random.Random(seed).
+                    spawns = random.Random(seed)
+                    rng = random.Random(seed + 1)
+                    for _ in range(TRACE_LENGTH):
+                        action = random_action(rng)
+                        play(game, action)
+                        if action == 'S':
+                            board.step(generate_spawn_row(spawns, size))
+                        else:
+                            board.apply_action({'L': ROTATE_LEFT_ACTION, 'R': ROTATE_RIGHT_ACTION,
+                                                'C': FIRE_COLLECT_ACTION,
+                                                'D': FIRE_DESTROY_ACTION}[action])
+                        self.assertEqual(board.serialise(), game.get_grid().serialise())
+                        self.assertEqual(
+                            (board.get_num_collected(), board.get_num_destroyed(),
+                             board.get_total_shots(), board.has_won(), board.has_lost()),
+                            (game.get_num_collected(), game.get_num_destroyed(),
+                             game.get_total_shots(), game.has_won(), game.has_lost()))
+
+
+@unittest.skipIf(np is None, "numpy is not installed")
+class BatchGameTest(unittest.TestCase):
+    '''An exact BatchGame matches one Game per seed until each game ends.'''
+    def test_exact_batch_matches_games(self) -> None:
+        seeds = list(range(40))
+        for size in SIZES:
+            with self.subTest(size = size):
+                batch = BatchGame(len(seeds), size, seeds, exact = True)
+                games = [Game(size, Grid, seed) for seed in seeds]
+                rng = random.Random(size)
+                for _ in range(TRACE_LENGTH):
+                    kind = rng.randrange(3)
+                    if kind == 0:
+                        actions = [rng.choice((None, LEFT, RIGHT)) for _ in seeds]
+                    elif kind == 1:
+                        actions = [rng.choice((None, COLLECT, DESTROY)) for _ in seeds]
+                    else:
+                        actions = [None] * len(seeds)
+                    active = batch.get_active().copy()
+                    if kind == 0:
+                        batch.rotate_grid(encode_directions(actions))
+                    elif kind == 1:
+                        batch.fire(encode_shots(actions))
+                    else:
+                        batch.step()
+                    for index, game in enumerate(games):
+                        if not active[index]:
+                            continue
+                        if kind == 0 and actions[index]:
+                            game.rotate_grid(actions[index])
+                        elif kind == 1 and actions[index]:
+                            game.fire(actions[index])
+                        elif kind == 2:
+                            game.step()
+                        self.assertEqual(batch.serialise(index), game.get_grid().serialise())
+                        self.assertEqual(
+                            (int(batch.get_num_collected()[index]),
+                             int(batch.get_num_destroyed()[index]),
+                             int(batch.get_total_shots()[index]),
+                             bool(batch.has_won()[index]), bool(batch.has_lost()[index])),
+                            (game.get_num_collected(), game.get_num_destroyed(),
+                             game.get_total_shots(), game.has_won(), game.has_lost()))
+
+
+if __name__ == '__main__':
+    unittest.main()
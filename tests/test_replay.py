@@ -0,0 +1,88 @@
+'''
+Replay tests.
+
+A RecordingGame plays a seeded trace of random inputs and its log is saved
+and loaded back. Replaying the log on every grid backend must rebuild the
+final state of the recorded game, and replaying up to a time must rebuild
+the state after the last event at or before that time.
+'''
+import os
+import random
+import tempfile
+import unittest
+
+from a3_support import *
+from a3_model import ArrayGrid, Game, Grid, ScrollingGrid
+from a3_replay import ReplayLog, RecordingGame, run_replay
+
+SIZE = 7
+TRACE_LENGTH = 400
+
+
+def game_state(game: Game) -> tuple:
+    '''
+    Return the board and counters of a game.
+
+    Parameters:
+        game: The game to inspect.
+    '''
+    return (game.get_grid().serialise(), game.get_num_collected(), game.get_num_destroyed(),
+            game.get_total_shots(), game.has_won(), game.has_lost())
+
+
+def record(seed: int) -> tuple:
+    '''
+    Play a seeded trace on a RecordingGame and return the game and its state
+    after every event.
+
+    Parameters:
+        seed: The seed of the game and of its inputs.
+    '''
+    game = RecordingGame(SIZE, ScrollingGrid, seed)
+    rng = random.Random(seed)
+    states = []
+    for _ in range(TRACE_LENGTH):
+        action = rng.randrange(5)
+        if action == 0:
+            game.step()
+        elif action < 3:
+            game.rotate_grid(rng.choice((LEFT, RIGHT)))
+        else:
+            game.fire(rng.choice((COLLECT, DESTROY)))
+        states.append(game_state(game))
+    return game, states
+
+
+class ReplayTest(unittest.TestCase):
+    '''Replaying a saved log rebuilds the recorded game.'''
+    def setUp(self) -> None:
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self._filename = os.path.join(directory.name, 'game.rep')
+
+    def test_round_trip(self) -> None:
+        for seed in range(4):
+            game, states = record(seed)
+            game.get_log().save(self._filename)
+            log = ReplayLog.load(self._filename)
+            self.assertEqual((log.get_size(), log.get_seed(), len(log)), (SIZE, seed, TRACE_LENGTH))
+            self.assertEqual(list(log.get_events()), list(game.get_log().get_events()))
+            for grid_type in (Grid, ArrayGrid, ScrollingGrid):
+                with self.subTest(seed = seed, grid_type = grid_type.__name__):
+                    self.assertEqual(game_state(run_replay(log, grid_type)), states[-1])
+
+    def test_replay_until(self) -> None:
+        game, states = record(0)
+        game.get_log().save(self._filename)
+        log = ReplayLog.load(self._filename)
+        times = [time_ms for time_ms, _ in log.get_events()]
+        for index in (0, TRACE_LENGTH // 3, TRACE_LENGTH // 2, TRACE_LENGTH - 1):
+            until = times[index]
+            # Every event recorded in the same millisecond is replayed too.
+            last = max(i for i, time_ms in enumerate(times) if time_ms <= until)
+            with self.subTest(until = until):
+                self.assertEqual(game_state(run_replay(log, Grid, until)), states[last])
+
+
+if __name__ == '__main__':
+    unittest.main()
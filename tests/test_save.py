@@ -0,0 +1,149 @@
+'''
+Save file tests.
+
+Games on every grid backend are written to binary saves and read back, and
+damaged binary saves and malformed text saves from earlier versions of the
+game must be rejected with ValueError.
+'''
+import os
+import random
+import tempfile
+import unittest
+
+from a3_support import *
+from a3_model import ArrayGrid, Game, Grid, ScrollingGrid
+from a3_save import COUNTERS, HEADER, SAVE_MAGIC, read_save, write_save
+
+SIZE = 7
+
+
+def played_game(grid_type: type, seed: int) -> Game:
+    '''
+    Return a game on a grid backend after a seeded trace of random actions.
+
+    Parameters:
+        grid_type: The grid backend of the game.
+        seed: The seed of the game and of its actions.
+    '''
+    game = Game(SIZE, grid_type, seed)
+    rng = random.Random(seed)
+    for _ in range(60):
+        action = rng.randrange(4)
+        if action == 0:
+            game.rotate_grid(rng.choice((LEFT, RIGHT)))
+        elif action == 1:
+            game.fire(rng.choice((COLLECT, DESTROY)))
+        else:
+            game.step()
+    return game
+
+
+def counters(game: Game) -> tuple:
+    '''
+    Return the counters of a game.
+
+    Parameters:
+        game: The game to inspect.
+    '''
+    return game.get_num_collected(), game.get_num_destroyed(), game.get_total_shots()
+
+
+class SaveTest(unittest.TestCase):
+    '''Binary and text saves load back the game they were written from.'''
+    def setUp(self) -> None:
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self._directory = directory.name
+
+    def path(self, name: str) -> str:
+        '''
+        Return the path of a file in the temporary directory of the test.
+
+        Parameters:
+            name: The file name.
+        '''
+        return os.path.join(self._directory, name)
+
+    def write_binary(self, game: Game) -> bytes:
+        '''
+        Return the bytes of a binary save of a game.
+
+        Parameters:
+            game: The game to save.
+        '''
+        write_save(self.path('game.bin'), game, 12, 34)
+        with open(self.path('game.bin'), 'rb') as f:
+            return f.read()
+
+    def assert_rejected(self, contents, mode: str = 'wb') -> None:
+        '''
+        Assert that a save file with the given contents is rejected.
+
+        Parameters:
+            contents: The contents of the save file.
+            mode: The mode the file is written with.
+        '''
+        with open(self.path('bad'), mode) as f:
+            f.write(contents)
+        with self.assertRaises(ValueError):
+            read_save(self.path('bad'), Game(SIZE))
+
+    def test_round_trip(self) -> None:
+        for saved_type in (Grid, ArrayGrid, ScrollingGrid):
+            for loaded_type in (Grid, ArrayGrid, ScrollingGrid):
+                for seed in range(4):
+                    with self.subTest(saved = saved_type.__name__, loaded = loaded_type.__name__,
+                                      seed = seed):
+                        game = played_game(saved_type, seed)
+                        write_save(self.path('game.bin'), game, 12, 34)
+                        loaded = Game(SIZE, loaded_type)
+                        self.assertEqual(read_save(self.path('game.bin'), loaded), (12, 34))
+                        self.assertEqual(loaded.get_grid().serialise(), game.get_grid().serialise())
+                        self.assertEqual(counters(loaded), counters(game))
+                        self.assertEqual([name for name in os.listdir(self._directory)
+                                          if name.endswith('.tmp')], [])
+
+    def test_rejects_bad_header(self) -> None:
+        data = self.write_binary(played_game(Grid, 0))
+        _, version, size = HEADER.unpack_from(data)
+        with self.subTest('magic'):
+            self.assert_rejected(b'HECK' + data[len(SAVE_MAGIC):])
+        with self.subTest('version'):
+            self.assert_rejected(HEADER.pack(SAVE_MAGIC, version + 1, size) + data[HEADER.size:])
+        with self.subTest('size'):
+            self.assert_rejected(HEADER.pack(SAVE_MAGIC, version, size + 1) + data[HEADER.size:])
+        with self.subTest('truncated header'):
+            self.assert_rejected(data[:HEADER.size - 1])
+        with self.subTest('truncated'):
+            self.assert_rejected(data[:-1])
+        with self.subTest('too long'):
+            self.assert_rejected(data + bytes(COUNTERS.size))
+        with self.subTest('cell code'):
+            cells = bytearray(data)
+            cells[HEADER.size + SIZE] = 255
+            self.assert_rejected(bytes(cells))
+
+    def test_text_save(self) -> None:
+        game = played_game(Grid, 1)
+        with open(self.path('game.txt'), 'w') as f:
+            for item in (game.get_grid().serialise(), 2, 3, 12, 34):
+                f.write(f'{item}\n')
+        loaded = Game(SIZE, ScrollingGrid)
+        self.assertEqual(read_save(self.path('game.txt'), loaded), (12, 34))
+        self.assertEqual(loaded.get_grid().serialise(), game.get_grid().serialise())
+        self.assertEqual(counters(loaded), (2, 3, 0))
+
+    def test_rejects_malformed_text_save(self) -> None:
+        fields = ['__import__("os")', '[1, 2]', "{1: 'C'}", "{(1.5, 2): 'C'}", "{(1, 2, 3): 'C'}",
+                  "{(1, 2): 3}", "{(1, 2): 'Q'}", "{[1]: 'C'}", '{', '']
+        for field in fields:
+            with self.subTest(field = field):
+                self.assert_rejected(f'{field}\n1\n2\n3\n4\n', 'w')
+        with self.subTest('lines'):
+            self.assert_rejected("{}\n1\n2\n3\n", 'w')
+        with self.subTest('counter'):
+            self.assert_rejected("{}\n1\ntwo\n3\n4\n", 'w')
+
+
+if __name__ == '__main__':
+    unittest.main()
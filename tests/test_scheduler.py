@@ -0,0 +1,182 @@
+'''
+TickScheduler tests.
+
+The scheduler only needs a clock and a master with after() and
+after_cancel(), so these tests drive it with a fake clock and a fake master
+whose pending callbacks run in due order as the clock is moved forward.
+'''
+import unittest
+from typing import Callable, Dict, List, Tuple
+
+from a3_support import *
+from a3_scheduler import TickProfiler, TickScheduler
+
+
+class FakeClock(object):
+    '''A wall clock that only moves when a test moves it.'''
+    def __init__(self) -> None:
+        '''The clock starts at zero seconds.'''
+        self.time = 0.0
+
+    def __call__(self) -> float:
+        '''Return the current time in seconds.'''
+        return self.time
+
+
+class FakeMaster(object):
+    '''A stand-in for a tk widget that runs after() callbacks on a FakeClock.'''
+    def __init__(self, clock: FakeClock) -> None:
+        '''
+        The master is constructed from the clock its callbacks run on.
+
+        Parameters:
+            clock: The clock of the test.
+        '''
+        self._clock = clock
+        self._pending: Dict[int, Tuple[float, Callable]] = {}
+        self._next_id = 0
+
+    def after(self, delay: int, callback: Callable) -> int:
+        '''Schedule a callback delay milliseconds from now and return its id.'''
+        self._next_id += 1
+        self._pending[self._next_id] = (self._clock.time + delay / 1000, callback)
+        return self._next_id
+
+    def after_cancel(self, after_id: int) -> None:
+        '''Cancel a pending callback.'''
+        del self._pending[after_id]
+
+    def get_pending(self) -> int:
+        '''Return the number of pending callbacks.'''
+        return len(self._pending)
+
+    def run_until(self, end: float, late: float = 0.0) -> None:
+        '''
+        Run the pending callbacks due by end in order, moving the clock to
+        each callback's due time plus late seconds, and then to end.
+
+        Parameters:
+            end: The time to run to, in seconds.
+            late: How late every callback wakes up, in seconds.
+        '''
+        while self._pending:
+            after_id, (due, callback) = min(self._pending.items(), key = lambda item: item[1][0])
+            if due > end:
+                break
+            del self._pending[after_id]
+            self._clock.time = max(self._clock.time, due + late)
+            callback()
+        self._clock.time = max(self._clock.time, end)
+
+
+class TickSchedulerTest(unittest.TestCase):
+    '''TickScheduler keeps every subscription on its game time period.'''
+    def setUp(self) -> None:
+        self.clock = FakeClock()
+        self.master = FakeMaster(self.clock)
+        self.scheduler = TickScheduler(self.master, self.clock)
+        self.calls: List[Tuple[str, float]] = []
+
+    def subscribe(self, name: str, interval: int, cost: float = 0.0) -> int:
+        '''
+        Subscribe a callback that records its name and the time it ran, and
+        then takes cost seconds.
+
+        Parameters:
+            name: The name recorded by the callback.
+            interval: The period of the callback in milliseconds.
+            cost: The seconds the callback takes.
+        '''
+        def callback() -> None:
+            self.calls.append((name, round(self.clock.time, 6)))
+            self.clock.time += cost
+        return self.scheduler.subscribe(interval, callback)
+
+    def times(self, name: str) -> List[float]:
+        '''Return the times a callback ran.'''
+        return [time for called, time in self.calls if called == name]
+
+    def test_no_drift(self) -> None:
+        # Late wake-ups and slow callbacks must not push later ticks back.
+        self.subscribe('tick', 1000, cost = 0.05)
+        self.master.run_until(10.0, late = 0.013)
+        self.assertEqual(self.times('tick'), [second + 0.013 for second in range(1, 11)])
+
+    def test_catch_up_cap(self) -> None:
+        profiler = TickProfiler()
+        self.scheduler.set_profiler(profiler)
+        self.subscribe('tick', 1000)
+        self.master.run_until(1.0)
+        # A stall of ten periods runs MAX_CATCH_UP_TICKS ticks at once and
+        # skips the rest, keeping the original phase.
+        self.clock.time = 11.5
+        self.master.run_until(11.5)
+        self.assertEqual(self.times('tick'), [1.0] + [11.5] * MAX_CATCH_UP_TICKS)
+        self.master.run_until(12.0)
+        self.assertEqual(self.times('tick')[-1], 12.0)
+        self.assertEqual(profiler.get_histogram(LATENESS_SECTION).get_count(),
+                         2 + MAX_CATCH_UP_TICKS)
+
+    def test_pause_resume(self) -> None:
+        self.subscribe('tick', 1000)
+        self.master.run_until(2.5)
+        self.scheduler.pause()
+        self.assertTrue(self.scheduler.is_paused())
+        self.assertEqual(self.master.get_pending(), 0)
+        self.clock.time = 100.0
+        self.scheduler.resume()
+        self.master.run_until(102.0)
+        # Game time stood still while paused: 0.5 s were left until the next tick.
+        self.assertEqual(self.times('tick'), [1.0, 2.0, 100.5, 101.5])
+        self.assertAlmostEqual(self.scheduler.get_time(), 4500.0)
+
+    def test_speed(self) -> None:
+        self.subscribe('tick', 1000)
+        self.master.run_until(1.0)
+        self.scheduler.set_speed(2)
+        self.master.run_until(3.0)
+        self.assertEqual(self.times('tick'), [1.0, 1.5, 2.0, 2.5, 3.0])
+        self.scheduler.set_speed(0.5)
+        self.master.run_until(7.0)
+        self.assertEqual(self.times('tick')[5:], [5.0, 7.0])
+        self.assertEqual(self.scheduler.get_speed(), 0.5)
+        with self.assertRaises(ValueError):
+            self.scheduler.set_speed(0)
+
+    def test_cancel(self) -> None:
+        tick = self.subscribe('tick', 1000)
+        self.subscribe('step', 2000)
+        self.master.run_until(1.9)
+        # Cancelling must not delay the other subscription's tick at 2 s.
+        self.scheduler.cancel(tick)
+        self.master.run_until(4.0)
+        self.assertEqual(self.times('tick'), [1.0])
+        self.assertEqual(self.times('step'), [2.0, 4.0])
+        self.scheduler.cancel(tick)
+        self.scheduler.cancel_all()
+        self.assertEqual(self.master.get_pending(), 0)
+        self.master.run_until(10.0)
+        self.assertEqual(len(self.calls), 3)
+
+    def test_cancel_from_callback(self) -> None:
+        subscriptions = []
+
+        def callback() -> None:
+            self.calls.append(('once', self.clock.time))
+            self.scheduler.cancel(subscriptions[0])
+        subscriptions.append(self.scheduler.subscribe(1000, callback))
+        self.clock.time = 5.0
+        self.master.run_until(10.0)
+        self.assertEqual(self.calls, [('once', 5.0)])
+
+    def test_restart(self) -> None:
+        self.subscribe('tick', 1000)
+        self.master.run_until(2.5)
+        self.scheduler.restart()
+        self.assertEqual(self.scheduler.get_time(), 0.0)
+        self.master.run_until(4.0)
+        self.assertEqual(self.times('tick'), [1.0, 2.0, 3.5])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+'''
+Simulation tests.
+
+Every game of a simulation is seeded, so its outcomes must not depend on the
+number of workers or on which games a worker played before. The win target
+of a simulation must reach the policies.
+'''
+import unittest
+
+from a3_support import *
+from a3_model import Collectable, Destroyable, Game, Grid
+from a3_bitboard import BitBoard
+from a3_bot import ExpectimaxBot
+from a3_simulate import POLICIES, SessionConfig, play_session, simulate
+
+GAMES = 8
+MAX_TICKS = 40
+
+
+class SimulateTest(unittest.TestCase):
+    '''Simulations are reproducible and honour their settings.'''
+    def test_workers_give_same_outcomes(self) -> None:
+        for policy in sorted(POLICIES):
+            for actions_per_step in (1, 2):
+                with self.subTest(policy = policy, actions_per_step = actions_per_step):
+                    config = SessionConfig(policy, max_ticks = MAX_TICKS,
+                                           actions_per_step = actions_per_step)
+                    serial = sorted(simulate(GAMES, config, seed = 3, workers = 1))
+                    parallel = sorted(simulate(GAMES, config, seed = 3, workers = 2))
+                    self.assertEqual(len(serial), GAMES)
+                    self.assertEqual(serial, parallel)
+
+    def test_game_order_does_not_matter(self) -> None:
+        config = SessionConfig('expectimax', max_ticks = MAX_TICKS, actions_per_step = 2)
+        seeds = list(range(5))
+        forward = [play_session(seed, config) for seed in seeds]
+        backward = [play_session(seed, config) for seed in reversed(seeds)]
+        self.assertEqual(forward, backward[::-1])
+
+    def test_target_is_reached(self) -> None:
+        for policy in ('greedy', 'expectimax'):
+            with self.subTest(policy = policy):
+                config = SessionConfig(policy, max_ticks = MAX_TICKS, target = 2,
+                                       actions_per_step = 2)
+                for outcome in simulate(GAMES, config, workers = 1):
+                    if outcome.won:
+                        self.assertEqual(outcome.collected, 2)
+                    self.assertLessEqual(outcome.collected, 2)
+
+    def test_bot_plays_to_target(self) -> None:
+        # A Collectable in the player's column, and a Destroyable next to it
+        # that loses the game on the next step unless it is shot first.
+        game = Game(7, Grid, 0)
+        grid = game.get_grid()
+        for position in list(grid.get_entities()):
+            if position != game.get_player_position():
+                grid.remove_entity(position)
+        grid.add_entity(Position(3, 5), Collectable())
+        grid.add_entity(Position(4, 2), Destroyable())
+        for target, expected in ((1, True), (COLLECTION_TARGET, False)):
+            with self.subTest(target = target):
+                bot = ExpectimaxBot(time_budget = None, max_depth = 3, actions_per_tick = 2,
+                                    seed = 0, target = target)
+                self.assertEqual(bot.choose_action(game) == FIRE_COLLECT_ACTION, expected)
+        board = BitBoard(7, target = 1)
+        self.assertEqual(board.get_target(), 1)
+        self.assertFalse(board.has_won())
+
+
+if __name__ == '__main__':
+    unittest.main()